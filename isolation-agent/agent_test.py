@@ -7,15 +7,24 @@ interface, but cannot be automatically assessed for correctness.
 STUDENTS SHOULD NOT NEED TO MODIFY THIS CODE.  IT WOULD BE BEST TO TREAT THIS
 FILE AS A BLACK BOX FOR TESTING.
 """
+import csv
+import io
+import json
+import os
 import random
+import tempfile
 import unittest
 import timeit
 import sys
 
 import isolation
 import game_agent
+import opening_book
+import sample_players
+import tournament
 
 from collections import Counter
+from contextlib import redirect_stdout
 from copy import deepcopy
 from copy import copy
 from functools import wraps
@@ -25,6 +34,11 @@ from multiprocessing import TimeoutError
 from queue import Empty as QueueEmptyError
 from importlib import reload
 
+try:
+    import openings_exploration
+except ImportError:
+    openings_exploration = None
+
 WRONG_MOVE = """
 The {} function failed because it returned a non-optimal move at search depth {}.
 Valid choices: {}
@@ -175,7 +189,8 @@ class CounterBoard(isolation.Board):
     of unique nodes and total nodes visited during depth first search.
 
     Some functions from the base class must be overridden to maintain the
-    counters during search.
+    counters during search, whether successors are generated by copying
+    (forecast_move) or in place (push/push_cell and pop).
     """
 
     def __init__(self, *args, **kwargs):
@@ -207,6 +222,19 @@ class CounterBoard(isolation.Board):
             new_board.root = move
         return new_board
 
+    def push_cell(self, cell):
+        move = divmod(cell, self.width)
+        self.counter[move] += 1
+        self.visited.add(move)
+        if not self.__undo_stack__:
+            self.root = move
+        super(CounterBoard, self).push_cell(cell)
+
+    def pop(self):
+        super(CounterBoard, self).pop()
+        if not self.__undo_stack__:
+            self.root = None
+
     @property
     def counts(self):
         """ Return counts of (total, unique) nodes visited """
@@ -536,5 +564,614 @@ class Project1Test(unittest.TestCase):
                 legal_moves, chosen_move))
 
 
+class BoardTest(unittest.TestCase):
+
+    def test_push_pop(self):
+        """ Test that Board.pop() exactly reverts Board.push() """
+        board = isolation.Board("Player1", "Player2")
+        board.apply_move((3, 3))
+        board.apply_move((0, 0))
+
+        expected = board.to_string()
+        moves = [board.get_legal_moves()]
+        for _ in range(6):
+            board.push(moves[-1][0])
+            moves.append(board.get_legal_moves())
+
+        for legal_moves in reversed(moves[:-1]):
+            board.pop()
+            self.assertEqual(legal_moves, board.get_legal_moves())
+
+        self.assertEqual(expected, board.to_string())
+        self.assertEqual(2, board.move_count)
+        self.assertEqual("Player1", board.active_player)
+        self.assertEqual((3, 3), board.get_player_location("Player1"))
+
+    def test_copy(self):
+        """ Test that a copy matches its board and evolves independently """
+        board = isolation.Board("Player1", "Player2")
+        board.apply_move((3, 3))
+        board.apply_move((0, 0))
+        board.get_mobility()
+
+        board_copy = board.copy()
+        self.assertEqual(board.to_string(), board_copy.to_string())
+        self.assertEqual(board.hash_key, board_copy.hash_key)
+        self.assertEqual(board.get_legal_moves(), board_copy.get_legal_moves())
+
+        expected = board.to_string()
+        board_copy.apply_move(board_copy.get_legal_moves()[0])
+        self.assertEqual(expected, board.to_string())
+        self.assertEqual((3, 3), board.get_player_location("Player1"))
+        self.assertEqual(len(board.get_legal_moves()), board.get_mobility())
+
+    def test_hash_key(self):
+        """ Test that transpositions share a Zobrist hash key """
+        board_1 = isolation.Board("Player1", "Player2")
+        board_2 = isolation.Board("Player1", "Player2")
+        for move in [(0, 0), (3, 3), (1, 2), (2, 1)]:
+            board_1.apply_move(move)
+        for move in [(3, 3), (0, 0), (1, 2), (2, 1)]:
+            board_2.apply_move(move)
+        self.assertEqual(board_1.hash_key, board_2.hash_key)
+
+        board_3 = board_1.forecast_move((0, 4))
+        self.assertNotEqual(board_1.hash_key, board_3.hash_key)
+
+        key = board_1.hash_key
+        board_1.push((0, 4))
+        self.assertEqual(board_3.hash_key, board_1.hash_key)
+        board_1.pop()
+        self.assertEqual(key, board_1.hash_key)
+
+    def test_mobility(self):
+        """ Test that the memoized mobility follows the board state """
+        board = isolation.Board("Player1", "Player2")
+        self.assertEqual(49, board.get_mobility())
+        board.apply_move((3, 3))
+        board.apply_move((1, 2))
+
+        for player in ("Player1", "Player2"):
+            self.assertEqual(len(board.get_legal_moves(player)),
+                             board.get_mobility(player))
+
+        board.push((1, 4))
+        self.assertEqual(len(board.get_legal_moves("Player1")),
+                         board.get_mobility("Player1"))
+        self.assertEqual(5, board.get_mobility("Player2"))
+        board.pop()
+        self.assertEqual(7, board.get_mobility("Player1"))
+        self.assertEqual(5, board.get_mobility("Player2"))
+
+    def test_canonical_hash(self):
+        """ Test that rotations and reflections share a canonical hash """
+        moves = [(0, 1), (3, 3), (2, 2)]
+        board = isolation.Board("Player1", "Player2")
+        for move in moves:
+            board.apply_move(move)
+        key, symmetry = board.canonical_hash()
+
+        for idx in range(8):
+            mirror = isolation.Board("Player1", "Player2")
+            for move in moves:
+                mirror.apply_move(board.transform_move(move, idx))
+            mirror_key, mirror_symmetry = mirror.canonical_hash()
+            self.assertEqual(key, mirror_key)
+
+            # Both boards map their moves to the same canonical move
+            for move in board.get_legal_moves():
+                mirror_move = board.transform_move(move, idx)
+                self.assertEqual(board.transform_move(move, symmetry),
+                                 mirror.transform_move(mirror_move, mirror_symmetry))
+
+        board.apply_move((1, 0))
+        self.assertNotEqual(key, board.canonical_hash()[0])
+
+    def test_partition(self):
+        """ Test that the board detects players walled off from each other """
+        board = isolation.Board("Player1", "Player2")
+        board.apply_move((0, 0))
+        board.apply_move((6, 6))
+        self.assertFalse(board.is_partitioned())
+        self.assertEqual(47, bin(board.get_reachable("Player1")).count("1"))
+
+        # Block every cell but a few next to Player1; Player2 is stuck
+        board.__board_state__ = (1 << 49) - 1
+        for row, col in [(1, 2), (2, 1), (3, 3), (1, 4), (2, 0)]:
+            board.__board_state__ ^= 1 << (row * 7 + col)
+        self.assertTrue(board.is_partitioned())
+        self.assertEqual(5, bin(board.get_reachable("Player1")).count("1"))
+        self.assertEqual(0, board.get_reachable("Player2"))
+
+    def test_simulate(self):
+        """ Test that simulated games match games played by Board.play() """
+        players = (sample_players.GreedyPlayer(), sample_players.RandomPlayer())
+        for seed in range(10):
+            results = []
+            for method in ("play", "simulate"):
+                random.seed(seed)
+                board = isolation.Board(*players)
+                board.apply_move((3, 3))
+                board.apply_move((2, 2))
+                if method == "play":
+                    winner, history, _ = board.play()
+                else:
+                    history = []
+                    winner, turns, _ = board.simulate(move_history=history)
+                    self.assertEqual(len(history), turns)
+                results.append((winner, history))
+            self.assertEqual(results[0], results[1])
+
+    def test_blank_cells(self):
+        """ Test that the blank cells match the blank spaces """
+        board = isolation.Board("Player1", "Player2", 5, 4)
+        for move in [None, (1, 2), (3, 4), (0, 0)]:
+            if move is not None:
+                board.apply_move(move)
+            spaces = board.get_blank_spaces()
+            self.assertEqual([row * 5 + col for row, col in spaces], board.get_blank_cells())
+            self.assertEqual(20 - board.move_count, len(spaces))
+
+    def test_bitboard_accessors(self):
+        """ Test the bitboard views of the board used by the heuristics """
+        board = isolation.Board("Player1", "Player2")
+        self.assertTrue(board.is_first_player("Player1"))
+        self.assertFalse(board.is_first_player("Player2"))
+        self.assertEqual(isolation.Board.NOT_MOVED, board.get_player_cell("Player1"))
+        self.assertEqual((1 << 49) - 1, board.get_open_cells())
+        board.apply_move((3, 3))
+        board.apply_move((0, 0))
+        self.assertEqual(24, board.get_player_cell("Player1"))
+        self.assertEqual(0, board.get_player_cell("Player2"))
+        self.assertEqual((1 << 49) - 1 - (1 << 24) - 1, board.get_open_cells())
+
+        masks = board.get_knight_masks()
+        for cell in (0, 24):
+            moves = [row * 7 + col for row, col in board.__get_moves__(divmod(cell, 7))]
+            self.assertEqual(sum(1 << move for move in moves),
+                             masks[cell] & board.get_open_cells())
+
+    def test_from_state(self):
+        """ Test that a board rebuilt from its state matches the original """
+        for moves in ([], [(3, 3)], [(3, 3), (0, 0), (1, 2)], [(3, 3), (0, 0), (1, 2), (2, 2)]):
+            board = isolation.Board("Player1", "Player2")
+            for move in moves:
+                board.apply_move(move)
+            rebuilt = isolation.Board.from_state("Player1", "Player2", *board.get_state())
+            self.assertEqual(board.get_state(), rebuilt.get_state())
+            self.assertEqual(board.hash_key, rebuilt.hash_key)
+            self.assertEqual(board.active_player, rebuilt.active_player)
+            self.assertEqual(board.get_legal_moves(), rebuilt.get_legal_moves())
+            self.assertEqual(board.to_string(), rebuilt.to_string())
+
+
+class TranspositionTableTest(unittest.TestCase):
+
+    def search(self, player, board, depth, alpha=float("-inf"), beta=float("inf")):
+        player.time_left = lambda: 1e4
+        player.root_move_count = board.move_count
+        return player.alphabeta(board, depth, alpha, beta)
+
+    def make_board(self, player_1, player_2):
+        board = isolation.Board(player_1, player_2)
+        for move in [(2, 3), (4, 4), (0, 2), (3, 5)]:
+            board.apply_move(move)
+        return board
+
+    def test_lookup_store(self):
+        """ Test that entries are found by their full key only """
+        tt = game_agent.TranspositionTable(8)
+        self.assertIsNone(tt.lookup(5))
+        tt.store(5, 3, 1.5, tt.EXACT, 10)
+        self.assertEqual((5, 3, 1.5, tt.EXACT, 10), tt.lookup(5)[:5])
+        self.assertIsNone(tt.lookup(13))
+        tt.clear()
+        self.assertIsNone(tt.lookup(5))
+        self.assertRaises(ValueError, game_agent.TranspositionTable, 0)
+        self.assertRaises(ValueError, game_agent.TranspositionTable, 8, 'never')
+
+    def test_replacement(self):
+        """ Test the depth-preferred and always-replace policies """
+        tt = game_agent.TranspositionTable(8, 'depth')
+        tt.store(5, 4, 1., tt.EXACT, 10)
+        tt.store(13, 2, 2., tt.EXACT, 11)
+        self.assertIsNotNone(tt.lookup(5))
+        self.assertIsNone(tt.lookup(13))
+        # Entries of an earlier search can be replaced by shallower ones
+        tt.new_search()
+        tt.store(13, 2, 2., tt.EXACT, 11)
+        self.assertIsNone(tt.lookup(5))
+        self.assertIsNotNone(tt.lookup(13))
+
+        tt = game_agent.TranspositionTable(8, 'always')
+        tt.store(5, 4, 1., tt.EXACT, 10)
+        tt.store(13, 2, 2., tt.EXACT, 11)
+        self.assertIsNone(tt.lookup(5))
+        self.assertIsNotNone(tt.lookup(13))
+
+    def test_bound_flags(self):
+        """ Test that fail-high and fail-low results are stored as bounds """
+        player = game_agent.CustomPlayer(method='alphabeta', iterative=False)
+        board = self.make_board(player, "Player2")
+        score = self.search(player, board, 3)[0]
+
+        for window, flag in [((score + 1, score + 2), game_agent.TranspositionTable.UPPER),
+                             ((score - 2, score - 1), game_agent.TranspositionTable.LOWER),
+                             ((score - 1, score + 1), game_agent.TranspositionTable.EXACT)]:
+            player = game_agent.CustomPlayer(method='alphabeta', iterative=False, tt_size=2**12)
+            board = self.make_board(player, "Player2")
+            self.search(player, board, 3, *window)
+            entry = player.tt.lookup(player.tt_key(board)[0])
+            self.assertEqual(flag, entry[3])
+            # Searching again with the table finds the same result
+            self.assertEqual(self.search(player, board, 3)[0], score)
+
+    def test_seats(self):
+        """ Test that entries stored in one seat are not used in the other """
+        player = game_agent.CustomPlayer(method='alphabeta', iterative=False, tt_size=2**12)
+        self.search(player, self.make_board(player, "Player2"), 4)
+
+        fresh = game_agent.CustomPlayer(method='alphabeta', iterative=False)
+        expected = self.search(fresh, self.make_board("Player1", fresh), 4)
+        self.assertEqual(expected, self.search(player, self.make_board("Player1", player), 4))
+        self.assertNotEqual(player.tt_key(self.make_board(player, "Player2")),
+                            player.tt_key(self.make_board("Player1", player)))
+
+
+class MoveOrderingTest(unittest.TestCase):
+
+    moves = [(3, 3), (6, 3), (1, 2), (5, 1), (3, 1), (3, 2), (5, 0), (5, 3), (6, 2), (6, 1)]
+
+    def test_order_moves(self):
+        """ Test the priority of the TT move, PV move, killers and history """
+        player = game_agent.CustomPlayer(move_ordering=True)
+        board = isolation.Board(player, "Player2")
+        board.apply_move((3, 3))
+        board.apply_move((0, 0))
+        legal_moves = board.get_legal_cells()
+        player.root_move_count = board.move_count
+        player.history = {legal_moves[1]: 1, legal_moves[2]: 5}
+        self.assertEqual(legal_moves[2], player.order_moves(board, legal_moves)[0])
+        self.assertEqual(legal_moves[1], player.order_moves(board, legal_moves)[1])
+
+        player.record_cutoff(board, legal_moves[3], 2)
+        player.record_cutoff(board, legal_moves[4], 1)
+        self.assertEqual([legal_moves[4], legal_moves[3]], player.killers[board.move_count])
+        self.assertEqual(4, player.history[legal_moves[3]])
+        self.assertEqual(legal_moves[4], player.order_moves(board, legal_moves)[0])
+
+        player.pv_move = legal_moves[5]
+        self.assertEqual(legal_moves[5], player.order_moves(board, legal_moves)[0])
+        ordered = player.order_moves(board, legal_moves, tt_move=legal_moves[6])
+        self.assertEqual(legal_moves[6:7] + legal_moves[5:6] + legal_moves[4:5], ordered[:3])
+        self.assertEqual(sorted(legal_moves), sorted(ordered))
+
+    def test_search(self):
+        """ Test that ordering changes the nodes searched, not the scores """
+        for tt_size in (None, 2**12):
+            results = []
+            for move_ordering in (False, True):
+                player = game_agent.CustomPlayer(method='alphabeta', tt_size=tt_size,
+                                                  move_ordering=move_ordering)
+                board = isolation.Board(player, "Player2")
+                for move in self.moves:
+                    board.apply_move(move)
+                # Stop during the seventh iteration
+                player.get_move(board, board.get_legal_moves(),
+                                lambda: 1e4 if len(player.node_counts) < 6 else 0)
+                self.assertEqual(6, len(player.node_counts))
+                self.assertEqual(6, len(player.depth_times))
+                results.append((player.pv_score, sum(player.node_counts)))
+            self.assertEqual(results[0][0], results[1][0])
+            self.assertLess(results[1][1], results[0][1])
+
+
+class EndgameTest(unittest.TestCase):
+
+    def test_solve_endgame(self):
+        """ Test that get_move() walks the longest path once partitioned """
+        player = game_agent.CustomPlayer(method='alphabeta', endgame=True)
+        board = isolation.Board(player, "Player2")
+        board.apply_move((0, 0))
+        board.apply_move((6, 6))
+        board.__board_state__ = (1 << 49) - 1
+        for row, col in [(1, 2), (2, 1), (3, 3), (1, 4), (2, 0)]:
+            board.__board_state__ ^= 1 << (row * 7 + col)
+
+        # (2, 1) leads to a four-move path through (3, 3), (1, 2) and (2, 0);
+        # (1, 2) leads to three moves at best
+        move = player.get_move(board, board.get_legal_moves(), lambda: 1e3)
+        self.assertEqual((2, 1), move)
+        self.assertEqual(0, player.nodes)
+
+
+class TimeManagementTest(unittest.TestCase):
+
+    def test_next_depth_time(self):
+        """ Test the prediction of the time of the next iteration """
+        player = game_agent.CustomPlayer()
+        player.node_counts, player.depth_times = [10], [2.]
+        self.assertEqual(0., player.next_depth_time())
+        player.node_counts, player.depth_times = [0, 10], [0., 2.]
+        self.assertEqual(0., player.next_depth_time())
+        player.node_counts, player.depth_times = [8, 10, 40], [1., 2., 5.]
+        self.assertEqual(20., player.next_depth_time())
+
+    def test_partial_move(self):
+        """ Test that an unfinished iteration is only trusted once the best
+        move of the previous iteration has been searched """
+        expired = []
+
+        def score_fn(game, player):
+            # Expire the timer in the third iteration, once the first root
+            # move (13 nodes below the root) has been searched
+            if len(player.node_counts) == 2 and player.nodes > 14:
+                expired.append(True)
+            return sample_players.improved_score(game, player)
+
+        player = game_agent.CustomPlayer(method='minimax', score_fn=score_fn,
+                                          time_management=True)
+        board = isolation.Board(player, "Player2")
+        for move in [(5, 2), (0, 0), (3, 1), (1, 2)]:
+            board.apply_move(move)
+        legal_moves = board.get_legal_moves()
+        self.assertEqual([(1, 0), (2, 3), (4, 3), (5, 0)], legal_moves)
+
+        # Depth 2 prefers (4, 3), which also beats (1, 0) at depth 3, so the
+        # best move so far of the third iteration must not be played
+        move = player.get_move(board, legal_moves, lambda: 0 if expired else 1e4)
+        self.assertEqual(2, len(player.node_counts))
+        self.assertEqual((4, 3), move)
+        self.assertIsNone(player.partial_move)
+
+
+class PVSTest(unittest.TestCase):
+
+    def test_pvs(self):
+        """ Test that PVS finds the alpha-beta score of a position """
+        for moves in [[(2, 3), (4, 4)], [(0, 0), (6, 6), (2, 1), (4, 5), (4, 2)]]:
+            scores = []
+            for method in ("alphabeta", "pvs"):
+                player = game_agent.CustomPlayer(method=method, iterative=False,
+                                                  tt_size=2**12, move_ordering=True)
+                player.time_left = lambda: 1e4
+                if len(moves) % 2:
+                    board = isolation.Board("Player1", player)
+                else:
+                    board = isolation.Board(player, "Player2")
+                for move in moves:
+                    board.apply_move(move)
+                player.root_move_count = board.move_count
+                search_fn = player.alphabeta if method == "alphabeta" else player.pvs
+                scores.append(search_fn(board, 4)[0])
+            self.assertAlmostEqual(scores[0], scores[1])
+
+    def test_get_move(self):
+        """ Test iterative deepening with PVS and aspiration windows """
+        player = game_agent.CustomPlayer(method='pvs', tt_size=2**12, move_ordering=True)
+        board = isolation.Board(player, "Player2")
+        board.apply_move((2, 3))
+        board.apply_move((4, 4))
+        legal_moves = board.get_legal_moves()
+        move = player.get_move(board, legal_moves, lambda: 1e4 if player.nodes < 2000 else 0)
+        self.assertIn(move, legal_moves)
+        self.assertGreater(len(player.node_counts), 2)
+
+
+class ParallelSearchTest(unittest.TestCase):
+
+    def test_parallel_search(self):
+        """ Test that root splitting finds the sequential search score """
+        for method in ('alphabeta', 'pvs'):
+            scores = []
+            for workers in (1, 2):
+                with game_agent.CustomPlayer(method=method, iterative=False,
+                                             search_depth=4, workers=workers) as player:
+                    board = isolation.Board(player, "Player2")
+                    for move in [(0, 0), (6, 6), (2, 1), (4, 5)]:
+                        board.apply_move(move)
+                    move = player.get_move(board, board.get_legal_moves(), lambda: 1e4)
+                self.assertIsNone(player.pool)
+                self.assertIn(move, board.get_legal_moves())
+                if workers == 1:
+                    player.root_move_count = board.move_count
+                    search_fn = player.pvs if method == 'pvs' else player.alphabeta
+                    scores.append(search_fn(board, 4)[0])
+                else:
+                    scores.append(player.pv_score)
+            self.assertAlmostEqual(scores[0], scores[1])
+
+
+class OpeningBookTest(unittest.TestCase):
+
+    def test_symmetric_lookup(self):
+        """ Test that book moves are found for reflected positions """
+        book = opening_book.OpeningBook(7, 7)
+        board = isolation.Board("Player1", "Player2")
+        board.apply_move((0, 1))
+        board.apply_move((3, 3))
+        book.add(board, (2, 2))
+        self.assertEqual(1, len(book))
+
+        # Transposing the board maps (0, 1) to (1, 0) and (2, 2) to itself
+        mirror = isolation.Board("Player1", "Player2")
+        mirror.apply_move((1, 0))
+        mirror.apply_move((3, 3))
+        self.assertEqual((2, 2), book.lookup(mirror))
+
+        # Reflecting the columns maps (0, 1) to (0, 5) and (2, 2) to (2, 4)
+        mirror = isolation.Board("Player1", "Player2")
+        mirror.apply_move((0, 5))
+        mirror.apply_move((3, 3))
+        self.assertEqual((2, 4), book.lookup(mirror))
+
+        mirror.apply_move((2, 4))
+        self.assertIsNone(book.lookup(mirror))
+
+    def test_get_move(self):
+        """ Test that CustomPlayer plays book moves without searching """
+        book = opening_book.OpeningBook(7, 7)
+        player = game_agent.CustomPlayer(method='alphabeta', opening_book=book)
+        board = isolation.Board(player, "Player2")
+        board.apply_move((0, 1))
+        board.apply_move((3, 3))
+        book.add(board, (2, 0))
+
+        move = player.get_move(board, board.get_legal_moves(), lambda: 1e3)
+        self.assertEqual((2, 0), move)
+        self.assertEqual(0, player.nodes)
+
+
+class BatchEvalTest(unittest.TestCase):
+
+    def test_batch_scores(self):
+        """ Test that batch scores match the scores of the leaf boards """
+        pairs = [(game_agent.custom_score, game_agent.batch_custom_score),
+                 (game_agent.second_order_score, game_agent.batch_second_order_score)]
+        player = game_agent.CustomPlayer()
+        for moves in [[], [(3, 3)], [(2, 3), (4, 4), (0, 2)], [(0, 0), (6, 6), (2, 1), (4, 5)]]:
+            for players in [(player, "Player2"), ("Player1", player)]:
+                board = isolation.Board(*players)
+                for move in moves:
+                    board.apply_move(move)
+                cells = board.get_legal_cells()
+                for score_fn, batch_score_fn in pairs:
+                    expected = []
+                    for cell in cells:
+                        board.push_cell(cell)
+                        expected.append(score_fn(board, player))
+                        board.pop()
+                    self.assertEqual(expected, batch_score_fn(board, player, cells))
+
+    def test_alphabeta(self):
+        """ Test that batching the leaves does not change the search """
+        results = []
+        for batch_score_fn in (None, game_agent.batch_custom_score):
+            player = game_agent.CustomPlayer(method='alphabeta', iterative=False,
+                                              batch_score_fn=batch_score_fn)
+            player.time_left = lambda: 1e4
+            board = isolation.Board(player, "Player2")
+            for move in [(0, 0), (6, 6), (2, 1), (4, 5)]:
+                board.apply_move(move)
+            player.root_move_count = board.move_count
+            results.append((player.alphabeta(board, 4), player.nodes))
+        self.assertEqual(results[0], results[1])
+
+
+class TournamentTest(unittest.TestCase):
+
+    def make_agents(self):
+        """ Create fixed-depth agents that collect search statistics """
+        args = {"method": 'alphabeta', "iterative": False, "collect_stats": True}
+        return [tournament.Agent(game_agent.CustomPlayer(search_depth=1, **args), "AB_1"),
+                tournament.Agent(game_agent.CustomPlayer(search_depth=2, **args), "AB_2")]
+
+    def play_round(self, executor):
+        stats = {}
+        with redirect_stdout(io.StringIO()):
+            win_ratio = tournament.play_round(self.make_agents(), 2, executor, 7, stats)
+        moves = {name: [(r['move_count'], r['nodes'], r['depth']) for r in records]
+                 for name, records in stats.items()}
+        return win_ratio, moves
+
+    def test_seeded_match(self):
+        """ Test that a seeded match does not depend on the random state """
+        results = []
+        for _ in range(2):
+            player1, player2 = [agent.player for agent in self.make_agents()]
+            random.seed(len(results))
+            results.append(tournament.seeded_match(player1, player2, 3))
+        self.assertEqual(results[0][:2], results[1][:2])
+        self.assertEqual(2, sum(results[0][:2]))
+        for records in results[0][2:]:
+            self.assertTrue(records)
+            self.assertEqual(set(game_agent.SearchStats.FIELDS), set(records[0]))
+
+    def test_executor(self):
+        """ Test that a seeded round has the same tally serially and in a
+        process pool """
+        executor = tournament.make_executor(2)
+        try:
+            parallel = self.play_round(executor)
+        finally:
+            executor.shutdown()
+        self.assertEqual(self.play_round(None), parallel)
+
+    def test_summarize(self):
+        """ Test the aggregation of search statistics records """
+        self.assertEqual({'moves': 0}, game_agent.SearchStats.summarize([]))
+        records = [dict(move_count=2, nodes=300, leaf_evals=200, cutoffs=10, depth=3,
+                        node_counts=[10, 90, 200], depth_times=[1., 2., 3.],
+                        elapsed=10., time_margin=40., timed_out=False),
+                   dict(move_count=4, nodes=100, leaf_evals=50, cutoffs=5, depth=5,
+                        node_counts=[5, 10, 15, 30, 40], depth_times=[1., 1., 1., 1., 1.],
+                        elapsed=30., time_margin=-2., timed_out=True)]
+        summary = game_agent.SearchStats.summarize(records)
+        self.assertEqual(2, summary['moves'])
+        self.assertEqual(400, summary['nodes'])
+        self.assertAlmostEqual(10000., summary['nodes_per_sec'])
+        self.assertAlmostEqual(4., summary['mean_depth'])
+        self.assertEqual(5, summary['max_depth'])
+        self.assertEqual(15, summary['cutoffs'])
+        self.assertEqual(250, summary['leaf_evals'])
+        self.assertEqual(-2., summary['min_time_margin'])
+
+    def test_write_stats(self):
+        """ Test that search statistics round-trip through JSON and CSV """
+        player = self.make_agents()[1].player
+        board = isolation.Board(player, "Player2")
+        for move in [(2, 3), (4, 4)]:
+            board.apply_move(move)
+            player.get_move(board, board.get_legal_moves(), lambda: 1e4)
+        stats = {"AB_2": player.stats.records}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "stats.json")
+            tournament.write_stats(stats, path)
+            with open(path) as f:
+                data = json.load(f)
+            self.assertEqual(stats["AB_2"], data["AB_2"]["records"])
+            self.assertEqual(game_agent.SearchStats.summarize(stats["AB_2"]),
+                             data["AB_2"]["summary"])
+
+            path = os.path.join(tmpdir, "stats.csv")
+            tournament.write_stats(stats, path)
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual(len(stats["AB_2"]), len(rows))
+        for record, row in zip(stats["AB_2"], rows):
+            self.assertEqual("AB_2", row["agent"])
+            self.assertEqual(record["nodes"], int(row["nodes"]))
+            self.assertEqual(record["node_counts"],
+                             [int(v) for v in row["node_counts"].split(";")])
+
+
+@unittest.skipIf(openings_exploration is None, "NumPy is not installed")
+class OpeningsExplorationTest(unittest.TestCase):
+
+    def test_resume(self):
+        """ Test that resuming a sweep only plays the missing cells """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = [os.path.join(tmpdir, "probs"), os.path.join(tmpdir, "dpths")]
+            probs, dpths = openings_exploration.sweep(4, 4, 2, 1, 5, False, *paths)
+            for values, path in zip((probs, dpths), paths):
+                self.assertFalse(openings_exploration.np.isnan(values).any())
+                self.assertEqual(values.tolist(),
+                                 openings_exploration.loadMap(path, 4, 4).tolist())
+
+            # Cells already filled in are kept as they are, and missing cells
+            # are replayed with the same seed
+            partial = openings_exploration.loadMap(paths[0], 4, 4)
+            partial[1:, :] = -1.
+            partial[0, 2] = openings_exploration.np.nan
+            openings_exploration.saveMap(partial, paths[0])
+            resumed, _ = openings_exploration.sweep(4, 4, 2, 1, 5, False, *paths)
+
+        expected = partial.copy()
+        expected[0, 2] = probs[0, 2]
+        self.assertEqual(expected.tolist(), resumed.tolist())
+        self.assertEqual([[-1.] * 4] * 3, resumed[1:, :].tolist())
+
+
 if __name__ == '__main__':
     unittest.main()
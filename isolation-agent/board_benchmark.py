@@ -0,0 +1,70 @@
+"""
+Measure the throughput of the Board operations used to generate successor
+states: `Board.copy()` (called once per turn by `Board.play()`) and
+`Board.forecast_move()` (called once per node by searches that copy the
+board rather than pushing and popping moves).
+
+Every operation is timed on the same set of mid-game positions, reached by
+playing seeded random moves from an empty board, and the table reports the
+best of `--repeat` runs in thousands of operations per second.
+
+Usage: python board_benchmark.py [--positions 20] [--plies 12]
+           [--number 2000] [--repeat 5] [--seed 0]
+"""
+import argparse
+import timeit
+
+from isolation import Board
+from search_benchmark import make_positions
+
+
+def run(positions, number, repeat):
+    """Return the copy() and forecast_move() throughput, in operations per
+    second, over every position and each of its legal moves."""
+    games = []
+    for moves in positions:
+        game = Board("Player1", "Player2")
+        for move in moves:
+            game.apply_move(move)
+        games.append((game, game.get_legal_moves()))
+
+    def copy_all():
+        for game, _ in games:
+            game.copy()
+
+    def forecast_all():
+        for game, legal_moves in games:
+            for move in legal_moves:
+                game.forecast_move(move)
+
+    copies = len(games) * number
+    forecasts = sum(len(legal_moves) for _, legal_moves in games) * number
+    copy_time = min(timeit.repeat(copy_all, number=number, repeat=repeat))
+    forecast_time = min(timeit.repeat(forecast_all, number=number, repeat=repeat))
+    return copies / copy_time, forecasts / forecast_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--positions", type=int, default=20,
+                        help="number of positions timed")
+    parser.add_argument("--plies", type=int, default=12,
+                        help="number of random moves played to reach each position")
+    parser.add_argument("--number", type=int, default=2000,
+                        help="passes over the positions per timed run")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of timed runs; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    positions = make_positions(args.positions, args.plies, args.seed)
+    copies, forecasts = run(positions, args.number, args.repeat)
+
+    print("{:>16}{:>12}".format("operation", "kops/s"))
+    print("{:>16}{:>12.1f}".format("copy", copies / 1000))
+    print("{:>16}{:>12.1f}".format("forecast_move", forecasts / 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ You must test your agent's strength against a set of agents with known
 relative strength using tournament.py and include the results in your report.
 """
 import random
+import time
+from multiprocessing import Pool
+from multiprocessing import TimeoutError as PoolTimeoutError
 from random import randint
 
 class Timeout(Exception):
@@ -46,8 +49,8 @@ def custom_score(game, player):
     if game.is_winner(player):
         return float("inf")
 
-    own_moves = len(game.get_legal_moves(player))
-    opp_moves = len(game.get_legal_moves(game.get_opponent(player)))
+    own_moves = game.get_mobility(player)
+    opp_moves = game.get_mobility(game.get_opponent(player))
     return float(own_moves - min(10,num_moves/psi)*opp_moves)
 
 
@@ -83,8 +86,8 @@ def weighted_improved_score(game, player):
     if game.is_winner(player):
         return float("inf")
 
-    own_moves = len(game.get_legal_moves(player))
-    opp_moves = len(game.get_legal_moves(game.get_opponent(player)))
+    own_moves = game.get_mobility(player)
+    opp_moves = game.get_mobility(game.get_opponent(player))
     return float(own_moves - psi*opp_moves)
 
 def blanks_score(game, player):
@@ -114,11 +117,303 @@ def blanks_score(game, player):
         return float("inf")
 
 
-    blanks = len(game.get_blank_spaces())
-    own_moves = len(game.get_legal_moves(player))
-    opp_moves = len(game.get_legal_moves(game.get_opponent(player)))
+    blanks = len(game.get_blank_cells())
+    own_moves = game.get_mobility(player)
+    opp_moves = game.get_mobility(game.get_opponent(player))
     return float(own_moves - opp_moves)/blanks
 
+def second_order_mobility(game, player):
+    """Return the number of open cells the player can reach in exactly two
+    moves (through an open cell), i.e., the mobility the player can count on
+    after its next move."""
+    masks = game.get_knight_masks()
+    reach = 0
+    for cell in game.get_legal_cells(player):
+        reach |= masks[cell]
+    return bin(reach & game.get_open_cells()).count("1")
+
+def second_order_score(game, player):
+    """Calculate the heuristic value of a game state using the legal moves
+    for each player, breaking ties between positions of equal mobility with
+    the second-order mobility of the players (see `second_order_mobility`).
+
+    Parameters
+    ----------
+    game : `isolation.Board`
+        An instance of `isolation.Board` encoding the current state of the
+        game (e.g., player locations and blocked cells).
+
+    player : object
+        A player instance in the current game (i.e., an object corresponding to
+        one of the player objects `game.__player_1__` or `game.__player_2__`.)
+
+    Returns
+    -------
+    float
+        The heuristic value of the current game state to the specified player.
+    """
+    if game.is_loser(player):
+        return float("-inf")
+
+    if game.is_winner(player):
+        return float("inf")
+
+    opponent = game.get_opponent(player)
+    own_moves = game.get_mobility(player)
+    opp_moves = game.get_mobility(opponent)
+    own_reach = second_order_mobility(game, player)
+    opp_reach = second_order_mobility(game, opponent)
+    return float(own_moves - opp_moves) + (own_reach - opp_reach) / 8.
+
+def _reach(masks, cells):
+    """Return the union of the knight-move bitmasks of every cell set in the
+    bitboard `cells`."""
+    reach = 0
+    while cells:
+        bit = cells & -cells
+        reach |= masks[bit.bit_length() - 1]
+        cells ^= bit
+    return reach
+
+def leaf_features(game, player, cells, second_order=False):
+    """Compute the mobility features of a batch of sibling leaf positions:
+    the positions reached when the active player of `game` moves to each of
+    `cells`.
+
+    The leaves only differ from their parent by the cell the active player
+    moved to, so the mobility of both players in every leaf is counted on
+    the knight-move bitmasks of the board (see
+    `isolation.Board.get_knight_masks()`) and the open cells of the parent,
+    without playing the moves. The moves of the other player are only
+    generated once for the whole batch.
+
+    Parameters
+    ----------
+    game : `isolation.Board`
+        The parent position of the leaves.
+
+    player : object
+        The player from whose point of view the features are computed.
+
+    cells : list<int>
+        The moves of the active player leading to the leaves, as cell
+        indexes (`row * width + col`).
+
+    second_order : bool (optional)
+        Flag indicating whether to compute the second-order mobility of the
+        players (see `second_order_mobility`).
+
+    Returns
+    -------
+    (list<int>, list<int>, list<int>, list<int>, bool)
+        The mobility of the player and of its opponent in each leaf, their
+        second-order mobility (None unless `second_order` is set), and
+        whether the player is the one to move in the leaves.
+    """
+    masks = game.get_knight_masks()
+    open_cells = game.get_open_cells()
+    other_cell = game.get_player_cell(game.inactive_player)
+    if other_cell is None:
+        other_moves = open_cells
+    else:
+        other_moves = masks[other_cell] & open_cells
+    other_count = bin(other_moves).count("1")
+
+    mover_counts = []
+    other_counts = []
+    mover_reach = other_reach = None
+    if second_order:
+        mover_reach = []
+        other_reach = []
+        other_union = _reach(masks, other_moves)
+
+    for cell in cells:
+        # The cell the active player moved to was open and cannot be reached
+        # from itself, so it only changes the moves of the other player
+        bit = 1 << cell
+        mover_moves = masks[cell] & open_cells
+        mover_counts.append(bin(mover_moves).count("1"))
+        blocked = other_moves & bit
+        other_counts.append(other_count - 1 if blocked else other_count)
+        if second_order:
+            leaf_open = open_cells ^ bit
+            union = _reach(masks, other_moves ^ bit) if blocked else other_union
+            mover_reach.append(bin(_reach(masks, mover_moves) & leaf_open).count("1"))
+            other_reach.append(bin(union & leaf_open).count("1"))
+
+    if player == game.active_player:
+        return mover_counts, other_counts, mover_reach, other_reach, False
+    return other_counts, mover_counts, other_reach, mover_reach, True
+
+def _terminal_score(score, own_moves, opp_moves, to_move):
+    """Score a leaf where the player to move has no legal moves as a win or
+    a loss, like `isolation.Board.utility()`."""
+    if to_move and not own_moves:
+        return float("-inf")
+    if not to_move and not opp_moves:
+        return float("inf")
+    return score
+
+def batch_custom_score(game, player, cells):
+    """Evaluate `custom_score` for a batch of sibling leaf positions (see
+    `leaf_features`).
+
+    Returns
+    -------
+    list<float>
+        The heuristic value of each leaf to the specified player.
+    """
+    if type(player) == CustomPlayer:
+        psi = player.psi
+    else:
+        psi = 20
+
+    own_moves, opp_moves, _, _, to_move = leaf_features(game, player, cells)
+    weight = min(10, (game.move_count + 1)/psi)
+    return [_terminal_score(float(own - weight*opp), own, opp, to_move)
+            for own, opp in zip(own_moves, opp_moves)]
+
+def batch_second_order_score(game, player, cells):
+    """Evaluate `second_order_score` for a batch of sibling leaf positions
+    (see `leaf_features`).
+
+    Returns
+    -------
+    list<float>
+        The heuristic value of each leaf to the specified player.
+    """
+    own_moves, opp_moves, own_reach, opp_reach, to_move = \
+        leaf_features(game, player, cells, second_order=True)
+    return [_terminal_score(float(own - opp) + (own_r - opp_r) / 8., own, opp, to_move)
+            for own, opp, own_r, opp_r in zip(own_moves, opp_moves, own_reach, opp_reach)]
+
+class TranspositionTable:
+    """Fixed-size table of alpha-beta search results keyed by the Zobrist
+    hash of the searched position (`isolation.Board.hash_key`, or
+    `isolation.Board.canonical_hash()` to share entries between symmetric
+    positions).
+
+    Each entry records the search depth, the score, whether the score is
+    exact or a lower/upper bound, and the best move found for the position.
+
+    Parameters
+    ----------
+    size : int (optional)
+        The number of slots in the table. Positions are mapped to a slot by
+        their hash key, so the table never grows beyond this size.
+
+    replacement : {'depth', 'always'} (optional)
+        The policy used when a new result maps to an occupied slot. 'always'
+        overwrites the slot; 'depth' keeps the entry searched to a greater
+        depth unless it was stored by an earlier search.
+    """
+
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    def __init__(self, size=2**16, replacement='depth'):
+        if size < 1:
+            raise ValueError("Transposition table size must be positive.")
+        if replacement not in ('depth', 'always'):
+            raise ValueError("Unknown replacement policy: {}".format(replacement))
+        self.size = size
+        self.replacement = replacement
+        self.clear()
+
+    def clear(self):
+        """Remove all entries from the table."""
+        self.slots = [None] * self.size
+        self.generation = 0
+
+    def new_search(self):
+        """Mark the entries stored so far as belonging to an earlier search
+        so that the depth-preferred policy can replace them."""
+        self.generation += 1
+
+    def lookup(self, key):
+        """Return the (key, depth, score, flag, move) entry stored for the
+        position hash `key`, or None if the position is not in the table."""
+        entry = self.slots[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        """Record the result of searching the position hash `key` to `depth`
+        plies, subject to the replacement policy."""
+        idx = key % self.size
+        entry = self.slots[idx]
+        if self.replacement == 'depth' and entry is not None and \
+                entry[5] == self.generation and entry[1] > depth:
+            return
+        self.slots[idx] = (key, depth, score, flag, move, self.generation)
+
+
+class SearchStats:
+    """Search statistics collected by a `CustomPlayer` created with
+    `collect_stats=True`.
+
+    Every call to get_move() that runs a search appends one record (a dict)
+    to `records` with the fields listed in `SearchStats.FIELDS`:
+
+    - move_count: number of moves played on the board before the search
+    - nodes: nodes visited, including any unfinished iteration
+    - leaf_evals: calls to the heuristic evaluation function
+    - cutoffs: alpha-beta cutoffs
+    - depth: deepest completed search depth
+    - node_counts: nodes visited by each completed depth
+    - depth_times: milliseconds spent on each completed depth
+    - elapsed: milliseconds spent in get_move()
+    - time_margin: milliseconds left on the timer beyond TIMER_THRESHOLD
+      when get_move() returned
+    - timed_out: whether the search was interrupted by the timer
+    """
+
+    FIELDS = ['move_count', 'nodes', 'leaf_evals', 'cutoffs', 'depth',
+              'node_counts', 'depth_times', 'elapsed', 'time_margin',
+              'timed_out']
+
+    def __init__(self):
+        self.records = []
+
+    def clear(self):
+        """Remove all records."""
+        self.records = []
+
+    @staticmethod
+    def summarize(records):
+        """Aggregate a list of records into a dict of totals and averages.
+
+        Parameters
+        ----------
+        records : list<dict>
+            Records produced by `SearchStats` (possibly from several players
+            of the same agent).
+
+        Returns
+        -------
+        dict
+            The number of moves searched, total nodes, nodes per second,
+            mean and maximum completed depth, total cutoffs and leaf
+            evaluations, and the smallest time margin observed.
+        """
+        if not records:
+            return {'moves': 0}
+        elapsed = sum(r['elapsed'] for r in records)
+        nodes = sum(r['nodes'] for r in records)
+        return {
+            'moves': len(records),
+            'nodes': nodes,
+            'nodes_per_sec': 1000. * nodes / elapsed if elapsed > 0 else float('inf'),
+            'mean_depth': sum(r['depth'] for r in records) / len(records),
+            'max_depth': max(r['depth'] for r in records),
+            'cutoffs': sum(r['cutoffs'] for r in records),
+            'leaf_evals': sum(r['leaf_evals'] for r in records),
+            'min_time_margin': min(r['time_margin'] for r in records),
+        }
+
+
 class ReflectionPlayer:
     """Player that reflects the movement of the other player """
 
@@ -157,29 +452,168 @@ class CustomPlayer:
         Flag indicating whether to perform fixed-depth search (False) or
         iterative deepening search (True).
 
-    method : {'minimax', 'alphabeta'} (optional)
-        The name of the search method to use in get_move().
+    method : {'minimax', 'alphabeta', 'pvs'} (optional)
+        The name of the search method to use in get_move(). 'pvs' runs
+        principal variation search (see `CustomPlayer.pvs()`) inside
+        aspiration windows centered on the score of the previous iterative
+        deepening iteration (see `CustomPlayer.aspiration_search()`).
 
     timeout : float (optional)
         Time remaining (in milliseconds) when search is aborted. Should be a
         positive value large enough to allow the function to return before the
         timer expires.
+
+    tt_size : int (optional)
+        Number of slots in the transposition table used by alphabeta(). The
+        table is disabled when None.
+
+    tt_replacement : {'depth', 'always'} (optional)
+        Replacement policy of the transposition table (see
+        `TranspositionTable`).
+
+    tt_symmetry : boolean (optional)
+        Flag indicating whether the transposition table is keyed by the
+        canonical hash of a position, so rotations and reflections of a
+        searched position hit the same entry. The canonical hash is
+        computed from scratch at every node, so this pays off mostly in the
+        opening, where symmetric positions are common.
+
+    move_ordering : boolean (optional)
+        Flag indicating whether alphabeta() should order moves using the
+        best move of the previous iterative deepening iteration, killer
+        moves and the history heuristic (True) or search them in the order
+        returned by the board (False).
+
+    collect_stats : boolean (optional)
+        Flag indicating whether to record search statistics for every move
+        in `self.stats` (see `SearchStats`).
+
+    workers : int (optional)
+        Number of processes used to search the root moves in parallel (see
+        `CustomPlayer.parallel_search()`). The search runs in the calling
+        process when 1. The worker processes are started by the first
+        search and run until `CustomPlayer.close()` is called, so callers
+        must close the player when they are done with it, e.g., by using
+        it as a context manager (`with CustomPlayer(workers=4) as player:`).
+
+    time_management : boolean (optional)
+        Flag indicating whether iterative deepening should stop as soon as
+        the next iteration is predicted not to finish in the time left (see
+        `CustomPlayer.next_depth_time()`), and fall back on the best move of
+        an unfinished iteration rather than the previous iteration once the
+        previous iteration's best move has been searched to the full depth.
+        Disabled by default.
+
+    endgame : boolean (optional)
+        Flag indicating whether get_move() should solve positions where the
+        players can no longer reach each other exactly (see
+        `CustomPlayer.solve_endgame()`) rather than search them, provided
+        the player can reach at most `ENDGAME_CELLS` cells. Disabled by
+        default.
+
+    opening_book : object (optional)
+        An opening book (e.g., `opening_book.OpeningBook`) whose
+        `lookup(game)` method returns the move to play in the current
+        position, or None to search it. Disabled when None.
+
+    batch_score_fn : callable (optional)
+        A function used by alphabeta() to score all the children of a node
+        one ply above the depth limit in a single call (e.g.,
+        `batch_custom_score`), with the signature
+        `batch_score_fn(game, player, cells)` described in `leaf_features`.
+        score_fn is still used where the search does not batch leaves
+        (minimax, pvs and searches to depth 0). Disabled when None.
+
+    Attributes
+    ----------
+    node_counts : list<int>
+        The number of nodes searched by each completed iteration of the last
+        call to get_move(); node_counts[i] is the node count at depth i+1.
+
+    depth_times : list<float>
+        The time (in milliseconds) spent on each completed iteration of the
+        last call to get_move().
+
+    stats : `SearchStats` or None
+        The search statistics, when enabled by `collect_stats`.
     """
 
+    # Largest region solved exactly by the endgame solver; the cost of the
+    # solver grows exponentially with the size of the region
+    ENDGAME_CELLS = 24
+
+    # Half-width of the aspiration window around the previous iteration's
+    # score, and the width of the null windows used by pvs()
+    ASPIRATION_WINDOW = 1.
+    NULL_WINDOW = 1e-9
+
+    # Mixed into the transposition table key when the player is player 2
+    # (see `CustomPlayer.tt_key()`)
+    TT_SEAT_KEY = 0x9e3779b97f4a7c15
+
     def __init__(self, search_depth=3, score_fn=custom_score,
-                 iterative=True, method='minimax', timeout=10.):
+                 iterative=True, method='minimax', timeout=10.,
+                 tt_size=None, tt_replacement='depth', tt_symmetry=False, move_ordering=False,
+                 collect_stats=False, workers=1, time_management=False,
+                 endgame=False, opening_book=None, batch_score_fn=None):
         self.search_depth = search_depth
         self.iterative = iterative
         self.score = score_fn
+        self.batch_score = batch_score_fn
         self.method = method
         self.time_left = None
         self.TIMER_THRESHOLD = timeout
+        if tt_size is None:
+            self.tt = None
+        else:
+            self.tt = TranspositionTable(tt_size, tt_replacement)
+        self.tt_symmetry = tt_symmetry
+        self.last_move_count = None
+        self.move_ordering = move_ordering
+        self.pv_move = None
+        self.pv_score = None
+        self.root_move_count = None
+        self.killers = {}
+        self.history = {}
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.cutoffs = 0
+        self.node_counts = []
+        self.depth_times = []
+        self.stats = SearchStats() if collect_stats else None
+        self.workers = workers
+        self.pool = None
+        self.time_management = time_management
+        self.partial_move = None
+        self.endgame = endgame
+        self.endgame_memo = {}
+        self.opening_book = opening_book
         self.openings = {
             'best':[(2,3),(3,4),(4,3),(3,2)],
             'second':[(r,c) for r in range(2,5) for c in range(2,5)]
         }
         self.psi = 10
 
+    def __getstate__(self):
+        # The timer is a closure over the current turn and cannot be pickled
+        # (e.g., to play matches in another process)
+        state = self.__dict__.copy()
+        state['time_left'] = None
+        state['pool'] = None
+        return state
+
+    def close(self):
+        """Shut down the worker processes of the parallel search, if any."""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def get_move(self, game, legal_moves, time_left):
         """Search for the best move from the available legal moves and return a
         result before the time limit expires.
@@ -222,11 +656,35 @@ class CustomPlayer:
         # move from the game board (i.e., an opening book), or returning
         # immediately if there are no legal moves
 
-        # Set search method
-        if self.method == 'minimax':
-            search_fn = self.minimax
-        else:
-            search_fn = self.alphabeta
+        # Results stored from the player's point of view in an earlier game
+        # are not valid in this one
+        new_game = self.last_move_count is not None and game.move_count < self.last_move_count
+        if new_game:
+            self.endgame_memo.clear()
+        if self.tt is not None:
+            if new_game:
+                self.tt.clear()
+            self.tt.new_search()
+        self.last_move_count = game.move_count
+
+        # Reset the search counters and move ordering state; history scores
+        # are aged rather than discarded since they stay relevant across turns
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.cutoffs = 0
+        self.node_counts = []
+        self.depth_times = []
+        self.pv_move = None
+        self.pv_score = None
+        self.root_move_count = game.move_count
+        self.killers = {}
+        self.history = {move: score // 2 for move, score in self.history.items() if score > 1}
+
+        # Play the precomputed reply to positions in the opening book
+        if self.opening_book is not None and legal_moves:
+            move = self.opening_book.lookup(game)
+            if move in legal_moves:
+                return move
 
         # Check if this is the first move
         if game.move_count <= 1:
@@ -245,31 +703,386 @@ class CustomPlayer:
                     return move
 
             return legal_moves[randint(0, len(legal_moves) - 1)]
+
+        if not legal_moves:
+            return (-1,-1)
+
+        # Once the players are walled off from each other the game reduces to
+        # how long each can keep moving, which is solved exactly when the
+        # player's region is small enough to solve within the time limit
+        if self.endgame and game.is_partitioned() and \
+                bin(game.get_reachable(self)).count("1") <= self.ENDGAME_CELLS:
+            return self.solve_endgame(game, legal_moves)
+
+        start = time_left()
+        move, timed_out = self.search(game, legal_moves)
+
+        if self.stats is not None:
+            remaining = time_left()
+            self.stats.records.append({
+                'move_count': game.move_count,
+                'nodes': sum(self.node_counts) + (self.nodes if timed_out else 0),
+                'leaf_evals': self.leaf_evals,
+                'cutoffs': self.cutoffs,
+                'depth': len(self.node_counts) if self.iterative else self.search_depth,
+                'node_counts': list(self.node_counts),
+                'depth_times': list(self.depth_times),
+                'elapsed': start - remaining,
+                'time_margin': remaining - self.TIMER_THRESHOLD,
+                'timed_out': timed_out,
+            })
+
+        return move
+
+    def search(self, game, legal_moves):
+        """Run the fixed-depth or iterative deepening search selected for the
+        player from the current game state.
+
+        Parameters
+        ----------
+        game : `isolation.Board`
+            An instance of `isolation.Board` encoding the current state of the
+            game (e.g., player locations and blocked cells).
+
+        legal_moves : list<(int, int)>
+            The (non-empty) list of legal moves for the player.
+
+        Returns
+        -------
+        (int, int)
+            The best move found by the search
+
+        bool
+            Whether the search was interrupted by the timer
+        """
+        if self.workers > 1:
+            return self.parallel_search(game, legal_moves)
+
+        # Set search method; the search runs on cell indexes, which are
+        # converted back to (row, col) moves on the way out
+        if self.method == 'minimax':
+            search_fn = self._minimax
+        elif self.method == 'pvs':
+            search_fn = self.aspiration_search
+        else:
+            search_fn = self._alphabeta
+
         try:
             # The search method call (alpha beta or minimax) should happen in
             # here in order to avoid timeout. The try/except block will
             # automatically catch the exception raised by the search method
             # when the timer gets close to expiring
-            if not legal_moves:
-                return (-1,-1)
+            if self.iterative:
+                # The game cannot last more plies than there are open cells,
+                # so deeper iterations would repeat the same search
+                max_depth = len(game.get_blank_cells())
+                depth = 1
+                while True:
+                    self.nodes = 0
+                    self.partial_move = None
+                    depth_start = self.time_left()
+                    best_move = search_fn(game, depth)
+                    self.node_counts.append(self.nodes)
+                    self.depth_times.append(depth_start - self.time_left())
+                    self.pv_move = best_move[1]
+                    self.pv_score = best_move[0]
+                    if depth >= max_depth:
+                        return _cell_to_move(game, best_move[1]), False
+                    if self.time_management and \
+                            self.next_depth_time() > self.time_left() - self.TIMER_THRESHOLD:
+                        # Stop rather than start an iteration that cannot
+                        # finish
+                        return _cell_to_move(game, best_move[1]), False
+                    depth += 1
             else:
-                if self.iterative:
-                    depth = 1
-                    while True:
-                        best_move = search_fn(game, depth)
-                        depth += 1
-                else:
-                    depth = self.search_depth
-                    return search_fn(game, depth)[1]
+                depth = self.search_depth
+                best_move = search_fn(game, depth)
+                self.node_counts.append(self.nodes)
+                return _cell_to_move(game, best_move[1]), False
 
         except Timeout:
             # Handle any actions required at timeout, if necessary
+            if self.time_management and self.iterative and self.partial_move is not None:
+                # The best move of the previous iteration was searched to the
+                # depth of the unfinished iteration, so the best move so far
+                # is backed by a deeper search (see update_partial_move())
+                return _cell_to_move(game, self.partial_move), True
             try:
                 # Return the best move from the last completed search iteration
-                return best_move[1]
+                return _cell_to_move(game, best_move[1]), True
             except NameError:
                 # Ran out of time before search finished, return random legal move
-                return legal_moves[randint(0, len(legal_moves) - 1)]
+                return legal_moves[randint(0, len(legal_moves) - 1)], True
+
+    def parallel_search(self, game, legal_moves):
+        """Run iterative deepening with the root moves split across a pool of
+        `self.workers` processes.
+
+        Every iteration searches the position after each root move as a
+        separate task (with the search method of the player, to one ply
+        less than the iteration depth), and picks the best root move once
+        all the tasks are done. Root moves are searched in the order of the
+        previous iteration's scores. Like the Young Brothers Wait Concept,
+        the first (expected best) root move is searched on its own, and
+        its score is the lower bound of the window of the other tasks, so
+        they can be pruned as in a sequential search. The workers stop at
+        the same time as the player's timer would (they share a wall-clock
+        deadline), and each keeps its own transposition table between
+        tasks.
+
+        Parameters
+        ----------
+        game : `isolation.Board`
+            An instance of `isolation.Board` encoding the current state of the
+            game (e.g., player locations and blocked cells).
+
+        legal_moves : list<(int, int)>
+            The (non-empty) list of legal moves for the player.
+
+        Returns
+        -------
+        (int, int)
+            The best move found by the search
+
+        bool
+            Whether the search was interrupted by the timer
+        """
+        if self.pool is None:
+            self.pool = Pool(self.workers, initializer=_init_worker,
+                             initargs=(self.worker_config(),))
+
+        deadline = time.time() + self.time_left() / 1000.
+        max_depth = len(game.get_blank_cells()) if self.iterative else self.search_depth
+        depth = 1 if self.iterative else self.search_depth
+        moves = list(legal_moves)
+        best_move = None
+
+        while True:
+            depth_start = self.time_left()
+            self.nodes = 0
+            scores = self.search_root_moves(game, moves[:1], depth, float("-inf"), deadline)
+            if scores and len(moves) > 1:
+                scores += self.search_root_moves(game, moves[1:], depth, scores[0][0], deadline)
+
+            if len(scores) < len(moves):
+                # Out of time; like search(), prefer the unfinished iteration
+                # once the previous best move has been searched
+                if self.time_management and scores:
+                    return max(scores, key=lambda s: s[0])[1], True
+                if best_move is not None:
+                    return best_move, True
+                return legal_moves[randint(0, len(legal_moves) - 1)], True
+
+            # Search the best moves first in the next iteration (the sort is
+            # stable, so ties keep their order)
+            scores.sort(key=lambda s: s[0], reverse=True)
+            moves = [m for _, m in scores]
+            best_move = moves[0]
+            self.node_counts.append(self.nodes)
+            self.depth_times.append(depth_start - self.time_left())
+            self.pv_move = best_move[0] * game.width + best_move[1]
+            self.pv_score = scores[0][0]
+
+            if depth >= max_depth:
+                return best_move, False
+            if self.time_management and \
+                    self.next_depth_time() > self.time_left() - self.TIMER_THRESHOLD:
+                return best_move, False
+            depth += 1
+
+    def search_root_moves(self, game, moves, depth, alpha, deadline):
+        """Search root moves in parallel on the worker processes of
+        `parallel_search()`.
+
+        Parameters
+        ----------
+        game : `isolation.Board`
+            The game state at the root of the search.
+
+        moves : list<(int, int)>
+            The root moves to search.
+
+        depth : int
+            The depth of the iteration, including the root move.
+
+        alpha : float
+            The lower bound on the score of the root; moves that cannot beat
+            it are only scored up to this bound.
+
+        deadline : float
+            The wall-clock time (see `time.time()`) at which the workers
+            stop searching.
+
+        Returns
+        -------
+        list<(float, (int, int))>
+            The score and move of every root move, in the order of `moves`,
+            up to the first move whose search did not finish in time.
+        """
+        tasks = []
+        for m in moves:
+            game.push(m)
+            try:
+                state = game.get_state()
+            finally:
+                game.pop()
+            spec = (game.width, game.height, game.is_first_player(self), state)
+            tasks.append(self.pool.apply_async(_search_task, ((spec, depth - 1, alpha, deadline),)))
+
+        scores = []
+        for m, task in zip(moves, tasks):
+            try:
+                score, nodes = task.get(max(0., self.time_left() - self.TIMER_THRESHOLD) / 1000.)
+            except PoolTimeoutError:
+                score, nodes = None, 0
+            self.nodes += nodes
+            if score is None:
+                break
+            scores.append((score, m))
+        return scores
+
+    def worker_config(self):
+        """Return the settings used to create the player of each worker
+        process of the parallel search."""
+        return {
+            'search_depth': self.search_depth,
+            'score_fn': self.score,
+            'iterative': False,
+            'method': self.method,
+            'timeout': self.TIMER_THRESHOLD,
+            'tt_size': None if self.tt is None else self.tt.size,
+            'tt_replacement': 'depth' if self.tt is None else self.tt.replacement,
+            'tt_symmetry': self.tt_symmetry,
+            'move_ordering': self.move_ordering,
+            'batch_score_fn': self.batch_score,
+            'psi': self.psi,
+        }
+
+    def update_partial_move(self, move, best_move):
+        """Record the best root move of an unfinished iterative deepening
+        iteration in `self.partial_move`, once the root move `move` has been
+        searched.
+
+        Root moves are not necessarily searched in the order of the previous
+        iteration, and a move that merely beats the moves searched so far
+        may be worse than the previous iteration's best move (`pv_move`).
+        The best move so far is only recorded once `pv_move` itself has
+        been searched to the new depth.
+
+        Parameters
+        ----------
+        move : int
+            The root move that has just been searched, as a cell index
+
+        best_move : int
+            The best root move searched so far, as a cell index
+        """
+        if self.partial_move is not None or self.pv_move is None or move == self.pv_move:
+            self.partial_move = best_move
+
+    def next_depth_time(self):
+        """Predict the time the next iterative deepening iteration will take
+        from the iterations completed so far.
+
+        The time of the last iteration is scaled by the effective branching
+        factor, i.e., the growth in the number of nodes searched between
+        the last two iterations.
+
+        Returns
+        -------
+        float
+            The predicted time (in milliseconds) of the next iteration
+        """
+        if len(self.node_counts) < 2 or not self.node_counts[-2]:
+            # Too few iterations to measure the growth of the tree; the
+            # first iterations are cheap, so always run them
+            return 0.
+        branching = float(self.node_counts[-1]) / self.node_counts[-2]
+        return self.depth_times[-1] * branching
+
+    def solve_endgame(self, game, legal_moves):
+        """Choose a move in a partitioned game (see
+        `isolation.Board.is_partitioned()`) by finding the longest path of
+        knight moves through the cells the player can still reach.
+
+        The opponent cannot interfere with the player any more, so walking
+        the longest path is optimal whether or not it outlasts the opponent.
+
+        Parameters
+        ----------
+        game : `isolation.Board`
+            A partitioned game state with the player to move.
+
+        legal_moves : list<(int, int)>
+            The (non-empty) list of legal moves for the player.
+
+        Returns
+        -------
+        (int, int)
+            The first move of the longest path; the best move solved so far
+            if the timer expires first.
+        """
+        width = game.width
+        masks = game.get_knight_masks()
+        region = game.get_reachable(self)
+        bound = bin(region).count("1")
+
+        best_length, best_move = -1, legal_moves[0]
+        try:
+            for move in legal_moves:
+                bit = 1 << (move[0] * width + move[1])
+                length = 1 + self.longest_path(masks, bit.bit_length() - 1, region & ~bit)
+                if length > best_length:
+                    best_length, best_move = length, move
+                    if length == bound:
+                        break
+        except Timeout:
+            pass
+        return best_move
+
+    def longest_path(self, masks, cell, open_cells):
+        """Return the largest number of knight moves that can be made from a
+        cell without revisiting a cell. Results are memoized in
+        `self.endgame_memo` for the rest of the game.
+
+        Parameters
+        ----------
+        masks : list<int>
+            The knight-move bitmasks of the board (see
+            `isolation.Board.get_knight_masks()`).
+
+        cell : int
+            The index (`row * width + col`) of the current cell.
+
+        open_cells : int
+            A bitboard of the cells that can still be visited.
+
+        Returns
+        -------
+        int
+            The length of the longest path starting at `cell`.
+        """
+        key = (cell, open_cells)
+        length = self.endgame_memo.get(key)
+        if length is not None:
+            return length
+
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise Timeout()
+
+        # No path can be longer than the number of cells left to visit
+        bound = bin(open_cells).count("1")
+        length = 0
+        moves = masks[cell] & open_cells
+        while moves:
+            bit = moves & -moves
+            moves ^= bit
+            length = max(length, 1 + self.longest_path(masks, bit.bit_length() - 1, open_cells & ~bit))
+            if length == bound:
+                break
+
+        self.endgame_memo[key] = length
+        return length
 
     def minimax(self, game, depth, maximizing_player=True):
         """Implement the minimax search algorithm as described in the lectures.
@@ -301,25 +1114,46 @@ class CustomPlayer:
             (1) You MUST use the `self.score()` method for board evaluation
                 to pass the project unit tests; you cannot call any other
                 evaluation function directly.
+
+            (2) Successor states are searched in place with
+                `game.push_cell()` and `game.pop()`, so `game` is unchanged
+                when the search returns or raises `Timeout`.
+
+            (3) The search itself runs in `_minimax()` on the integer move
+                encoding of the board (see `isolation.Board.get_legal_cells()`);
+                moves are converted to (row, col) only here.
         """
+        score, cell = self._minimax(game, depth, maximizing_player)
+        return score, _cell_to_move(game, cell)
+
+    def _minimax(self, game, depth, maximizing_player=True):
+        """Search the game tree like `CustomPlayer.minimax()`, with moves encoded
+        as cell indexes."""
         if self.time_left() < self.TIMER_THRESHOLD:
             raise Timeout()
+        self.nodes += 1
 
         # Get the legal moves
-        legal_moves = game.get_legal_moves()
+        legal_moves = game.get_legal_cells()
         if legal_moves:
             # Check if max depth has been reached
             if depth == 0:
                 # Apply heuristic to score moves
-                return (self.score(game, self), game.get_player_location(self))
+                self.leaf_evals += 1
+                return (self.score(game, self), -1)
             # Max depth not reached, call minimax again
             else:
                 # Call minimax for each remaining move to get scores of branch
                 scores = []
                 for m in legal_moves:
-                    new_game = game.forecast_move(m)
-                    score = self.minimax(new_game, depth-1, not maximizing_player)
+                    game.push_cell(m)
+                    try:
+                        score = self._minimax(game, depth-1, not maximizing_player)
+                    finally:
+                        game.pop()
                     scores.append((score[0], m))
+                    if game.move_count == self.root_move_count:
+                        self.update_partial_move(m, max(scores)[1])
 
             # Return score based on maximizing criteria
             if maximizing_player:
@@ -329,10 +1163,164 @@ class CustomPlayer:
         else:
             # No valid moves remain
             if maximizing_player:
-                return (-float('inf'), (-1,-1))
+                return (-float('inf'), -1)
+            else:
+                return (float('inf'), -1)
+
+
+    def tt_key(self, game):
+        """Return the transposition table key of the position and, when the
+        table is keyed by the canonical hash, the symmetry that maps the
+        position to its canonical orientation (0 otherwise).
+
+        Scores are stored from the player's point of view, while the board
+        hash tells the seats apart rather than the players, so the key also
+        encodes the seat of the player: entries stay valid if the player
+        changes seats between games.
+        """
+        if self.tt_symmetry:
+            key, symmetry = game.canonical_hash()
+        else:
+            key, symmetry = game.hash_key, 0
+        if not game.is_first_player(self):
+            key ^= self.TT_SEAT_KEY
+        return key, symmetry
+
+    def tt_probe(self, game, depth, alpha, beta):
+        """Look up the position in the transposition table before searching
+        it to `depth` plies with the window (alpha, beta).
+
+        Entries keyed by the canonical hash store their move in the
+        canonical orientation; the move returned here is mapped back to the
+        orientation of `game`.
+
+        Returns
+        -------
+        (int, int)
+            The key and symmetry of the position (see `tt_key()`), to be
+            passed on to `tt_store()`
+
+        int or None
+            The best move stored for the position, if any
+
+        float, float
+            The window narrowed by a bound stored for the position
+
+        (float, int) or None
+            The score and move to return without searching the position when
+            the stored result is deep enough to decide it, None otherwise
+        """
+        key = self.tt_key(game)
+        entry = self.tt.lookup(key[0])
+        if entry is None:
+            return key, None, alpha, beta, None
+
+        _, tt_depth, tt_score, tt_flag, tt_move = entry[:5]
+        if self.tt_symmetry:
+            tt_move = game.transform_cell(tt_move, key[1], inverse=True)
+        if tt_depth >= depth:
+            if tt_flag == TranspositionTable.EXACT:
+                return key, tt_move, alpha, beta, (tt_score, tt_move)
+            elif tt_flag == TranspositionTable.LOWER:
+                alpha = max(alpha, tt_score)
             else:
-                return (float('inf'), (-1,-1))
+                beta = min(beta, tt_score)
+            if beta <= alpha:
+                return key, tt_move, alpha, beta, (tt_score, tt_move)
+        return key, tt_move, alpha, beta, None
+
+    def tt_store(self, game, key, depth, best_score, alpha, beta):
+        """Record the result of searching the position to `depth` plies
+        with the window (alpha, beta) in the transposition table, as an
+        exact score or as a bound when it fell outside the window.
+
+        Parameters
+        ----------
+        game : isolation.Board
+            The searched position
+
+        key : (int, int)
+            The key and symmetry of the position returned by `tt_probe()`
+
+        depth : int
+            The depth of the search
+
+        best_score : (float, int)
+            The score and best move found by the search
+
+        alpha, beta : float
+            The window of the search before `tt_probe()` narrowed it
+        """
+        score, move = best_score
+        if score <= alpha:
+            flag = TranspositionTable.UPPER
+        elif score >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        if self.tt_symmetry:
+            move = game.transform_cell(move, key[1])
+        self.tt.store(key[0], depth, score, flag, move)
+
+    def order_moves(self, game, legal_moves, tt_move=None):
+        """Order moves for alpha-beta search: the transposition table move,
+        then the best move of the previous iterative deepening iteration (at
+        the root), then the killer moves for this ply, then the remaining
+        moves by history score.
+
+        Parameters
+        ----------
+        game : isolation.Board
+            An instance of the Isolation game `Board` class representing the
+            current game state
+
+        legal_moves : list<int>
+            The legal moves of the active player in `game`, as cell indexes
+            (`row * width + col`)
+
+        tt_move : int (optional)
+            The best move stored in the transposition table for `game`
+
+        Returns
+        -------
+        list<int>
+            The legal moves in the order they should be searched
+        """
+        history = self.history
+        ordered = sorted(legal_moves, key=lambda m: history.get(m, 0), reverse=True)
+
+        # Promote in reverse priority so the most trusted move ends up first
+        promoted = list(reversed(self.killers.get(game.move_count, ())))
+        if game.move_count == self.root_move_count:
+            promoted.append(self.pv_move)
+        promoted.append(tt_move)
 
+        for move in promoted:
+            if move in ordered:
+                ordered.remove(move)
+                ordered.insert(0, move)
+        return ordered
+
+    def record_cutoff(self, game, move, depth):
+        """Record a move that caused a beta cutoff at the current ply as a
+        killer move and credit it in the history table.
+
+        Parameters
+        ----------
+        game : isolation.Board
+            The game state in which `move` caused the cutoff
+
+        move : int
+            The move that caused the cutoff, as a cell index
+
+        depth : int
+            The remaining search depth at the cutoff
+        """
+        killers = self.killers.setdefault(game.move_count, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
 
     def alphabeta(self, game, depth, alpha=float("-inf"), beta=float("inf"), maximizing_player=True):
         """Implement minimax search with alpha-beta pruning as described in the
@@ -371,48 +1359,316 @@ class CustomPlayer:
             (1) You MUST use the `self.score()` method for board evaluation
                 to pass the project unit tests; you cannot call any other
                 evaluation function directly.
+
+            (2) Successor states are searched in place with
+                `game.push_cell()` and `game.pop()`, so `game` is unchanged
+                when the search returns or raises `Timeout`.
+
+            (3) The search itself runs in `_alphabeta()` on the integer move
+                encoding of the board (see `isolation.Board.get_legal_cells()`);
+                moves are converted to (row, col) only here.
+
+            (4) With a `batch_score_fn`, the children of nodes one ply above
+                the depth limit are scored together instead of being pushed
+                and evaluated one at a time, including those a cutoff skips.
         """
+        score, cell = self._alphabeta(game, depth, alpha, beta, maximizing_player)
+        return score, _cell_to_move(game, cell)
+
+    def _alphabeta(self, game, depth, alpha=float("-inf"), beta=float("inf"), maximizing_player=True):
+        """Search the game tree like `CustomPlayer.alphabeta()`, with moves encoded
+        as cell indexes."""
         if self.time_left() < self.TIMER_THRESHOLD:
             raise Timeout()
+        self.nodes += 1
 
         # Get the legal moves
-        legal_moves = game.get_legal_moves()
+        legal_moves = game.get_legal_cells()
         if legal_moves:
             # Check if max depth has been reached
             if depth == 0:
                 # Apply heuristic to score move
-                return (self.score(game, self), game.get_player_location(self))
+                self.leaf_evals += 1
+                return (self.score(game, self), -1)
+
+            # Reuse the result of an earlier search of this position
+            tt_move = None
+            if self.tt is not None:
+                alpha_orig, beta_orig = alpha, beta
+                key, tt_move, alpha, beta, result = self.tt_probe(game, depth, alpha, beta)
+                if result is not None:
+                    return result
+
+            if self.move_ordering:
+                legal_moves = self.order_moves(game, legal_moves, tt_move)
+            elif tt_move in legal_moves:
+                # Search the best move of the earlier search first
+                legal_moves.remove(tt_move)
+                legal_moves.insert(0, tt_move)
+
+            # Score all the children of the node at once when they are leaves
+            leaf_scores = None
+            if depth == 1 and self.batch_score is not None:
+                leaf_scores = self.batch_score(game, self, legal_moves)
+                self.leaf_evals += len(legal_moves)
 
             if maximizing_player:
-                best_score = (float('-inf'),(-1,-1))
-                for m in legal_moves:
-                    new_game = game.forecast_move(m)
-                    score = self.alphabeta(new_game, depth-1, alpha, beta, False)
-                    score = (score[0], m)
+                best_score = (float('-inf'),-1)
+                for i, m in enumerate(legal_moves):
+                    if leaf_scores is None:
+                        game.push_cell(m)
+                        try:
+                            score = self._alphabeta(game, depth-1, alpha, beta, False)
+                        finally:
+                            game.pop()
+                        score = (score[0], m)
+                    else:
+                        self.nodes += 1
+                        score = (leaf_scores[i], m)
                     best_score = max(best_score, score)
                     alpha = max(alpha, best_score[0])
+                    if game.move_count == self.root_move_count:
+                        self.update_partial_move(m, best_score[1])
                     if beta <= alpha:
                         # Trim this branch
+                        self.cutoffs += 1
+                        if self.move_ordering:
+                            self.record_cutoff(game, m, depth)
                         break
-
-                return best_score
             else:
-                best_score = (float('inf'),(-1,-1))
-                for m in legal_moves:
-                    new_game = game.forecast_move(m)
-                    score = self.alphabeta(new_game, depth-1, alpha, beta, True)
-                    score = (score[0], m)
+                best_score = (float('inf'),-1)
+                for i, m in enumerate(legal_moves):
+                    if leaf_scores is None:
+                        game.push_cell(m)
+                        try:
+                            score = self._alphabeta(game, depth-1, alpha, beta, True)
+                        finally:
+                            game.pop()
+                        score = (score[0], m)
+                    else:
+                        self.nodes += 1
+                        score = (leaf_scores[i], m)
                     best_score = min(best_score, score)
                     beta = min(beta, best_score[0])
                     if beta <= alpha:
+                        self.cutoffs += 1
+                        if self.move_ordering:
+                            self.record_cutoff(game, m, depth)
                         break
 
-                return best_score
+            if self.tt is not None:
+                self.tt_store(game, key, depth, best_score, alpha_orig, beta_orig)
+
+            return best_score
 
 
         else:
             # No valid moves remain
             if maximizing_player:
-                return (-float('inf'), (-1,-1))
+                return (-float('inf'), -1)
+            else:
+                return (float('inf'), -1)
+
+    def aspiration_search(self, game, depth):
+        """Run principal variation search from the root inside an aspiration
+        window: a narrow window around the score of the previous iterative
+        deepening iteration, widened to an open bound on the side where the
+        search fails.
+
+        Parameters
+        ----------
+        game : isolation.Board
+            An instance of the Isolation game `Board` class representing the
+            current game state
+
+        depth : int
+            Depth is an integer representing the maximum number of plies to
+            search in the game tree before aborting
+
+        Returns
+        -------
+        float
+            The score for the current search branch
+
+        int
+            The best move for the current branch as a cell index
+            (`row * width + col`); -1 for no legal moves
+        """
+        guess = self.pv_score
+        if guess is None or guess in (float("inf"), float("-inf")):
+            return self._pvs(game, depth)
+
+        alpha = guess - self.ASPIRATION_WINDOW
+        beta = guess + self.ASPIRATION_WINDOW
+        while True:
+            # A search that failed outside the window says nothing about the
+            # best root move, so it must not leave one behind for a timeout
+            self.partial_move = None
+            score = self._pvs(game, depth, alpha, beta)
+            if score[0] <= alpha != float("-inf"):
+                alpha = float("-inf")
+            elif score[0] >= beta != float("inf"):
+                beta = float("inf")
             else:
-                return (float('inf'), (-1,-1))
+                return score
+
+    def pvs(self, game, depth, alpha=float("-inf"), beta=float("inf")):
+        """Implement principal variation search (NegaScout) in negamax form:
+        the first move of every node is searched with the full (alpha, beta)
+        window and the remaining moves with a null window that only tests
+        whether they beat the best score so far; a move that does is
+        searched again with the full window.
+
+        Scores are from the point of view of the player to move in `game`,
+        so the score of a position is the negated score of its successor.
+        With good move ordering the first move is usually the best one and
+        most null-window searches are cut off quickly.
+
+        Parameters
+        ----------
+        game : isolation.Board
+            An instance of the Isolation game `Board` class representing the
+            current game state
+
+        depth : int
+            Depth is an integer representing the maximum number of plies to
+            search in the game tree before aborting
+
+        alpha : float
+            The lower bound of the search window
+
+        beta : float
+            The upper bound of the search window
+
+        Returns
+        -------
+        float
+            The score for the current search branch, from the point of view
+            of the player to move
+
+        tuple(int, int)
+            The best move for the current branch; (-1, -1) for no legal moves
+        """
+        score, cell = self._pvs(game, depth, alpha, beta)
+        return score, _cell_to_move(game, cell)
+
+    def _pvs(self, game, depth, alpha=float("-inf"), beta=float("inf")):
+        """Search the game tree like `CustomPlayer.pvs()`, with moves encoded
+        as cell indexes."""
+        if self.time_left() < self.TIMER_THRESHOLD:
+            raise Timeout()
+        self.nodes += 1
+
+        legal_moves = game.get_legal_cells()
+        if not legal_moves:
+            # The player to move has lost
+            return (float('-inf'), -1)
+
+        if depth == 0:
+            self.leaf_evals += 1
+            score = self.score(game, self)
+            if game.active_player != self:
+                score = -score
+            return (score, -1)
+
+        # Reuse the result of an earlier search of this position
+        tt_move = None
+        if self.tt is not None:
+            alpha_orig, beta_orig = alpha, beta
+            key, tt_move, alpha, beta, result = self.tt_probe(game, depth, alpha, beta)
+            if result is not None:
+                return result
+
+        if self.move_ordering:
+            legal_moves = self.order_moves(game, legal_moves, tt_move)
+        elif tt_move in legal_moves:
+            legal_moves.remove(tt_move)
+            legal_moves.insert(0, tt_move)
+
+        best_score = (float('-inf'), legal_moves[0])
+        for idx, m in enumerate(legal_moves):
+            game.push_cell(m)
+            try:
+                if idx == 0 or alpha == float('-inf'):
+                    score = -self._pvs(game, depth-1, -beta, -alpha)[0]
+                else:
+                    score = -self._pvs(game, depth-1, -alpha - self.NULL_WINDOW, -alpha)[0]
+                    if alpha < score < beta:
+                        # The move beat the best score so far; search it
+                        # again for its exact score
+                        score = -self._pvs(game, depth-1, -beta, -alpha)[0]
+            finally:
+                game.pop()
+
+            if score > best_score[0]:
+                best_score = (score, m)
+            alpha = max(alpha, score)
+            if game.move_count == self.root_move_count:
+                self.update_partial_move(m, best_score[1])
+            if beta <= alpha:
+                self.cutoffs += 1
+                if self.move_ordering:
+                    self.record_cutoff(game, m, depth)
+                break
+
+        if self.tt is not None:
+            self.tt_store(game, key, depth, best_score, alpha_orig, beta_orig)
+
+        return best_score
+
+
+# The player searching root moves in a worker process of the parallel search
+_worker_player = None
+
+
+def _init_worker(config):
+    """Process pool initializer of the parallel search: create the player
+    that searches the tasks of the worker from the settings returned by
+    `CustomPlayer.worker_config()`."""
+    global _worker_player
+    config = dict(config)
+    psi = config.pop('psi')
+    _worker_player = CustomPlayer(**config)
+    _worker_player.psi = psi
+
+
+def _search_task(args):
+    """Search the position after a root move for the worker's player and
+    return its score (None if the deadline passed) and the nodes searched.
+
+    The position is described by the board size, whether the worker's
+    player is player 1, and the state returned by `Board.get_state()`;
+    scores that cannot beat `alpha` are only bounded by it."""
+    from isolation import Board
+
+    spec, depth, alpha, deadline = args
+    width, height, is_player_1, state = spec
+    player = _worker_player
+    players = (player, "Opponent") if is_player_1 else ("Opponent", player)
+    game = Board.from_state(*players, *state, width=width, height=height)
+
+    # The root of the search is the player's move before this position
+    if player.tt is not None and player.last_move_count != game.move_count:
+        player.tt.new_search()
+    player.last_move_count = game.move_count
+    player.root_move_count = game.move_count - 1
+    player.time_left = lambda: 1000. * (deadline - time.time())
+    player.nodes = 0
+    try:
+        if player.method == 'minimax':
+            score = player.minimax(game, depth, False)[0]
+        elif player.method == 'pvs':
+            score = -player.pvs(game, depth, float("-inf"), -alpha)[0]
+        else:
+            score = player.alphabeta(game, depth, alpha, maximizing_player=False)[0]
+    except Timeout:
+        score = None
+    return score, player.nodes
+
+
+def _cell_to_move(game, cell):
+    """Convert a cell index (`row * width + col`) of the board's integer move
+    encoding to a (row, col) move; negative indexes mean no move."""
+    if cell < 0:
+        return (-1, -1)
+    return divmod(cell, game.width)
@@ -8,14 +8,151 @@ remain compatible with the defaults provided, and none of your changes will
 be available to project reviewers.
 """
 
+import random
 import timeit
 
-from copy import deepcopy
-from copy import copy
-
 
 TIME_LIMIT_MILLIS = 200
 
+# Offsets (row, column) of the L-shaped moves available to each player
+KNIGHT_DIRECTIONS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                     (1, -2),  (1, 2), (2, -1),  (2, 1)]
+
+# Move and hashing tables shared by every board of the same (width, height)
+_BOARD_TABLES = {}
+
+
+class BoardTables(object):
+    """
+    The move and hashing tables of a board of one size. The tables never
+    change, so they are built once per size by `board_tables()` and shared
+    by every board of that size.
+
+    Cells are numbered in row-major order (i.e., `row * width + col`). The
+    knight destinations of each cell are computed once; the coordinate and
+    bitmask views used by the board are derived from them.
+
+    Attributes
+    ----------
+    coords : list<(int, int)>
+        The coordinate pair (row, column) of every cell.
+
+    knight_cells : list<list<(int, int)>>
+        The in-bounds knight destinations of every cell as (bit, cell)
+        pairs in the order of `KNIGHT_DIRECTIONS`, where `bit` is the
+        bitboard mask of the destination cell.
+
+    knight_moves : list<list<(int, (int, int))>>
+        The destinations of `knight_cells` as (bit, (row, col)) pairs.
+
+    knight_masks : list<int>
+        The bitmask of the knight destinations of every cell.
+
+    blank_cells, blank_moves : list<(int, int)>, list<(int, (int, int))>
+        Every cell as a (bit, cell) and a (bit, (row, col)) pair, in the
+        column-major order used by `Board.get_blank_spaces()`.
+
+    zobrist_keys : (list<list<int>>, int)
+        A list of per-cell keys indexed by player symbol -- index 0 marks a
+        blocked cell, indexes 1 and 2 mark the location of player 1 and
+        player 2 -- and the key toggled each time the initiative changes.
+        The keys are drawn from a generator seeded with the board size, so
+        every board of the same size (and every process) hashes a position
+        to the same value.
+    """
+    __slots__ = ('width', 'height', 'coords', 'knight_cells', 'knight_moves',
+                 'knight_masks', 'blank_cells', 'blank_moves', 'zobrist_keys',
+                 '__symmetries__')
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.coords = [divmod(cell, width) for cell in range(width * height)]
+        self.knight_cells = [[(1 << ((r + dr) * width + c + dc), (r + dr) * width + c + dc)
+                              for dr, dc in KNIGHT_DIRECTIONS
+                              if 0 <= r + dr < height and 0 <= c + dc < width]
+                             for r, c in self.coords]
+        self.knight_moves = [self.as_moves(dests) for dests in self.knight_cells]
+        self.knight_masks = [sum(bit for bit, _ in dests) for dests in self.knight_cells]
+        self.blank_cells = [(1 << (i * width + j), i * width + j)
+                            for j in range(width) for i in range(height)]
+        self.blank_moves = self.as_moves(self.blank_cells)
+
+        rng = random.Random(width * 1000003 + height)
+        keys = [[rng.getrandbits(64) for _ in range(width * height)] for _ in range(3)]
+        self.zobrist_keys = (keys, rng.getrandbits(64))
+        self.__symmetries__ = None
+
+    def as_moves(self, cells):
+        """ Map a list of (bit, cell) pairs to (bit, (row, col)) pairs. """
+        return [(bit, self.coords[cell]) for bit, cell in cells]
+
+    def symmetries(self):
+        """
+        Return the symmetries of the board as permutations of its cells.
+
+        Knight moves are preserved by every rotation and reflection of the
+        board, so symmetric positions have the same game value. A square
+        board has 8 symmetries, any other board 4 (the identity, the two
+        reflections and the half turn). The identity is always symmetry 0.
+        The permutations are only built the first time they are needed.
+
+        Returns
+        ----------
+        (list<list<int>>, list<list<int>>)
+            The permutations, where perm[cell] is the cell that `cell` is
+            mapped to, and their inverses.
+        """
+        if self.__symmetries__ is None:
+            width, height = self.width, self.height
+            maps = [lambda r, c: (r, c),
+                    lambda r, c: (height - 1 - r, c),
+                    lambda r, c: (r, width - 1 - c),
+                    lambda r, c: (height - 1 - r, width - 1 - c)]
+            if width == height:
+                maps += [lambda r, c: (c, r),
+                         lambda r, c: (c, height - 1 - r),
+                         lambda r, c: (width - 1 - c, r),
+                         lambda r, c: (width - 1 - c, height - 1 - r)]
+
+            perms = []
+            inverses = []
+            for f in maps:
+                perm = [0] * (width * height)
+                inverse = [0] * (width * height)
+                for cell, (r, c) in enumerate(self.coords):
+                    tr, tc = f(r, c)
+                    perm[cell] = tr * width + tc
+                    inverse[tr * width + tc] = cell
+                perms.append(perm)
+                inverses.append(inverse)
+            self.__symmetries__ = (perms, inverses)
+        return self.__symmetries__
+
+
+def board_tables(width, height):
+    """
+    Return the `BoardTables` of a board of the specified size.
+
+    Parameters
+    ----------
+    width : int
+        The number of columns on the board.
+
+    height : int
+        The number of rows on the board.
+
+    Returns
+    ----------
+    `isolation.BoardTables`
+        The tables shared by every board of that size.
+    """
+    tables = _BOARD_TABLES.get((width, height))
+    if tables is None:
+        tables = BoardTables(width, height)
+        _BOARD_TABLES[(width, height)] = tables
+    return tables
+
 
 class Board(object):
     """
@@ -37,10 +174,37 @@ class Board(object):
 
     height : int (optional)
         The number of rows that the board should have.
+
+    Notes
+    -----
+        The board state is stored as a bitboard: a single integer with bit
+        `row * width + col` set for every blocked cell. Legal moves are found
+        by masking the precomputed knight moves of a cell with the open
+        cells, so copying a board only copies a handful of ints. The class
+        uses `__slots__`, and `Board.copy()` skips `__init__` to share the
+        move tables with the original board.
+
+        Internally, moves and player locations are encoded as cell indexes
+        (`row * width + col`). The (row, col) coordinates of the public
+        interface are converted at the boundary; the `*_cell` methods (e.g.,
+        `Board.get_legal_cells()` and `Board.push_cell()`) expose the
+        integer encoding for search code that wants to avoid allocating a
+        tuple per move.
+
+        The board also maintains an incremental Zobrist hash of the blocked
+        cells, both player locations and the player with initiative (see
+        `Board.hash_key`), and can compute a hash shared by all positions
+        that are rotations or reflections of each other (see
+        `Board.canonical_hash()`).
     """
     BLANK = 0
     NOT_MOVED = None
 
+    __slots__ = ('width', 'height', 'move_count', '__player_1__', '__player_2__',
+                 '__active_player__', '__inactive_player__', '__board_state__',
+                 '__tables__', '__undo_stack__', '__hash_key__', '__mobility__',
+                 '__last_player_move__', '__player_symbols__')
+
     def __init__(self, player_1, player_2, width=7, height=7):
         self.width = width
         self.height = height
@@ -49,7 +213,11 @@ class Board(object):
         self.__player_2__ = player_2
         self.__active_player__ = player_1
         self.__inactive_player__ = player_2
-        self.__board_state__ = [[Board.BLANK for i in range(width)] for j in range(height)]
+        self.__board_state__ = 0
+        self.__tables__ = board_tables(width, height)
+        self.__undo_stack__ = []
+        self.__hash_key__ = 0
+        self.__mobility__ = {}
         self.__last_player_move__ = {player_1: Board.NOT_MOVED, player_2: Board.NOT_MOVED}
         self.__player_symbols__ = {Board.BLANK: Board.BLANK, player_1: 1, player_2: 2}
 
@@ -69,6 +237,102 @@ class Board(object):
         """
         return self.__inactive_player__
 
+    @property
+    def hash_key(self):
+        """
+        The Zobrist hash of the current game state. Positions reached by
+        different move orders share the same key.
+        """
+        return self.__hash_key__
+
+    def canonical_hash(self):
+        """
+        Return a Zobrist hash of the current game state that is the same for
+        every rotation and reflection of the state (see
+        `BoardTables.symmetries()`), i.e., the smallest `hash_key` among the
+        symmetric states.
+
+        Unlike `hash_key` the canonical hash is not maintained incrementally;
+        computing it visits every blocked cell once per symmetry.
+
+        Returns
+        ----------
+        (int, int)
+            The canonical hash and the index of a symmetry that maps the
+            current state onto the canonical orientation (see
+            `Board.transform_move()`).
+        """
+        perms = self.__tables__.symmetries()[0]
+        cell_keys, turn_key = self.__tables__.zobrist_keys
+        blocked_keys = cell_keys[0]
+
+        # The turn key is toggled by every move, so it is set when the number
+        # of blocked cells is odd
+        base = turn_key if self.move_count % 2 else 0
+        hashes = [base] * len(perms)
+        state = self.__board_state__
+        while state:
+            bit = state & -state
+            cell = bit.bit_length() - 1
+            for idx, perm in enumerate(perms):
+                hashes[idx] ^= blocked_keys[perm[cell]]
+            state ^= bit
+
+        for player in (self.__player_1__, self.__player_2__):
+            cell = self.__last_player_move__[player]
+            if cell is not Board.NOT_MOVED:
+                player_keys = cell_keys[self.__player_symbols__[player]]
+                for idx, perm in enumerate(perms):
+                    hashes[idx] ^= player_keys[perm[cell]]
+
+        return min((key, idx) for idx, key in enumerate(hashes))
+
+    def transform_move(self, move, symmetry, inverse=False):
+        """
+        Map a move through one of the board's symmetries.
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column). Moves off the board (e.g.,
+            (-1, -1) for no move) are returned unchanged.
+
+        symmetry : int
+            The index of the symmetry (e.g., as returned by
+            `Board.canonical_hash()`).
+
+        inverse : bool (optional)
+            Map the move back from the transformed orientation when True.
+
+        Returns
+        ----------
+        (int, int)
+            The coordinate pair (row, column) of the transformed move.
+        """
+        row, col = move
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return move
+        return divmod(self.transform_cell(row * self.width + col, symmetry, inverse), self.width)
+
+    def transform_cell(self, cell, symmetry, inverse=False):
+        """
+        Map a cell index (`row * width + col`) through one of the board's
+        symmetries, like `Board.transform_move()`. Negative indexes (e.g.,
+        -1 for no move) are returned unchanged.
+        """
+        if cell < 0:
+            return cell
+        perms, inverses = self.__tables__.symmetries()
+        table = inverses if inverse else perms
+        return table[symmetry][cell]
+
+    def is_first_player(self, player):
+        """
+        Test whether the specified player is player 1, i.e., the player
+        who moved first in the game.
+        """
+        return player is self.__player_1__
+
     def get_opponent(self, player):
         """
         Return the opponent of the supplied player.
@@ -91,15 +355,92 @@ class Board(object):
             return self.__active_player__
         raise RuntimeError("`player` must be an object registered as a player in the current game.")
 
+    @classmethod
+    def from_state(cls, player_1, player_2, board_state, locations, move_count,
+                   width=7, height=7):
+        """
+        Create a board in an arbitrary game state, e.g., to rebuild a
+        position described by `Board.get_state()` in another process.
+
+        Parameters
+        ----------
+        player_1, player_2 : object
+            The players of the game (see `Board`).
+
+        board_state : int
+            A bitboard with bit `row * width + col` set for every blocked
+            cell.
+
+        locations : (int, int)
+            The cell indexes (`row * width + col`) of player 1 and player 2;
+            `Board.NOT_MOVED` for a player that has not moved yet.
+
+        move_count : int
+            The number of moves played so far, which decides the player
+            with initiative.
+
+        width, height : int (optional)
+            The size of the board.
+
+        Returns
+        ----------
+        `isolation.Board`
+            A board with an empty undo stack and the hash key of the state.
+        """
+        board = cls(player_1, player_2, width, height)
+        board.__board_state__ = board_state
+        board.move_count = move_count
+        if move_count % 2:
+            board.__active_player__, board.__inactive_player__ = player_2, player_1
+
+        cell_keys, turn_key = board.__tables__.zobrist_keys
+        hash_key = turn_key if move_count % 2 else 0
+        state = board_state
+        while state:
+            bit = state & -state
+            hash_key ^= cell_keys[0][bit.bit_length() - 1]
+            state ^= bit
+        for player, cell in zip((player_1, player_2), locations):
+            board.__last_player_move__[player] = cell
+            if cell is not Board.NOT_MOVED:
+                hash_key ^= cell_keys[board.__player_symbols__[player]][cell]
+        board.__hash_key__ = hash_key
+        return board
+
+    def get_state(self):
+        """
+        Return the game state in the form accepted by `Board.from_state()`:
+        the bitboard of blocked cells, the cell indexes of player 1 and
+        player 2, and the move count.
+        """
+        return (self.__board_state__,
+                (self.__last_player_move__[self.__player_1__],
+                 self.__last_player_move__[self.__player_2__]),
+                self.move_count)
+
     def copy(self):
-        """ Return a deep copy of the current board. """
-        new_board = Board(self.__player_1__, self.__player_2__, width=self.width, height=self.height)
+        """ Return a deep copy of the current board. The copy starts with an
+        empty undo stack, so moves pushed on this board cannot be popped from
+        the copy.
+        """
+        # Bypass __init__: the move tables are shared by every board of the
+        # same size and the player symbols never change, so only the mutable
+        # state has to be duplicated.
+        new_board = object.__new__(Board)
+        new_board.width = self.width
+        new_board.height = self.height
         new_board.move_count = self.move_count
+        new_board.__player_1__ = self.__player_1__
+        new_board.__player_2__ = self.__player_2__
         new_board.__active_player__ = self.__active_player__
         new_board.__inactive_player__ = self.__inactive_player__
-        new_board.__last_player_move__ = copy(self.__last_player_move__)
-        new_board.__player_symbols__ = copy(self.__player_symbols__)
-        new_board.__board_state__ = deepcopy(self.__board_state__)
+        new_board.__board_state__ = self.__board_state__
+        new_board.__tables__ = self.__tables__
+        new_board.__undo_stack__ = []
+        new_board.__hash_key__ = self.__hash_key__
+        new_board.__mobility__ = self.__mobility__.copy()
+        new_board.__last_player_move__ = self.__last_player_move__.copy()
+        new_board.__player_symbols__ = self.__player_symbols__
         return new_board
 
     def forecast_move(self, move):
@@ -140,14 +481,20 @@ class Board(object):
         row, col = move
         return 0 <= row < self.height and \
                0 <= col < self.width and \
-               self.__board_state__[row][col] == Board.BLANK
+               not self.__board_state__ >> (row * self.width + col) & 1
 
     def get_blank_spaces(self):
         """
         Return a list of the locations that are still available on the board.
         """
-        return [(i, j) for j in range(self.width) for i in range(self.height)
-            if self.__board_state__[i][j] == Board.BLANK]
+        return self.__open_cells__(Board.NOT_MOVED, as_moves=True)
+
+    def get_blank_cells(self):
+        """
+        Return the indexes (`row * width + col`) of the cells that are still
+        available on the board, in the order of `Board.get_blank_spaces()`.
+        """
+        return self.__open_cells__(Board.NOT_MOVED)
 
     def get_player_location(self, player):
         """
@@ -163,8 +510,34 @@ class Board(object):
         (int, int)
             The coordinate pair (row, column) of the input player.
         """
+        cell = self.__last_player_move__[player]
+        if cell is Board.NOT_MOVED:
+            return Board.NOT_MOVED
+        return divmod(cell, self.width)
+
+    def get_player_cell(self, player):
+        """
+        Return the location of the specified player as a cell index
+        (`row * width + col`), like `Board.get_player_location()`;
+        `Board.NOT_MOVED` if the player has not moved yet.
+        """
         return self.__last_player_move__[player]
 
+    def get_open_cells(self):
+        """
+        Return a bitboard with bit `row * width + col` set for every cell
+        that is still available on the board.
+        """
+        return ~self.__board_state__ & ((1 << (self.width * self.height)) - 1)
+
+    def get_knight_masks(self):
+        """
+        Return the knight-move bitmasks of the board, indexed by cell (see
+        `BoardTables.knight_masks`). The list is shared by every board of
+        the same size and must not be modified.
+        """
+        return self.__tables__.knight_masks
+
     def get_legal_moves(self, player=None):
         """
         Return the list of all legal moves for the specified player.
@@ -183,7 +556,114 @@ class Board(object):
         """
         if player is None:
             player = self.active_player
-        return self.__get_moves__(self.__last_player_move__[player])
+        moves = self.__open_cells__(self.__last_player_move__[player], as_moves=True)
+        self.__mobility__[player] = len(moves)
+        return moves
+
+    def get_legal_cells(self, player=None):
+        """
+        Return the legal moves for the specified player as cell indexes
+        (`row * width + col`), in the order of `Board.get_legal_moves()`.
+
+        Parameters
+        ----------
+        player : object (optional)
+            An object registered as a player in the current game. If None,
+            return the legal moves for the active player on the board.
+
+        Returns
+        ----------
+        list<int>
+            The indexes of the cells the player can move to.
+        """
+        if player is None:
+            player = self.active_player
+        cells = self.__open_cells__(self.__last_player_move__[player])
+        self.__mobility__[player] = len(cells)
+        return cells
+
+    def get_mobility(self, player=None):
+        """
+        Return the number of legal moves for the specified player.
+
+        The count is memoized until the board changes (by `apply_move`,
+        `push` or `pop`), so heuristics can query the mobility of both
+        players -- directly or through `is_winner`, `is_loser` and
+        `utility` -- without generating the same moves more than once.
+
+        Parameters
+        ----------
+        player : object (optional)
+            An object registered as a player in the current game. If None,
+            return the mobility of the active player on the board.
+
+        Returns
+        ----------
+        int
+            The number of legal moves for the player.
+        """
+        if player is None:
+            player = self.active_player
+        mobility = self.__mobility__.get(player)
+        if mobility is None:
+            cell = self.__last_player_move__[player]
+            if cell is Board.NOT_MOVED:
+                mobility = self.width * self.height - bin(self.__board_state__).count("1")
+            else:
+                open_moves = self.__tables__.knight_masks[cell] & ~self.__board_state__
+                mobility = bin(open_moves).count("1")
+            self.__mobility__[player] = mobility
+        return mobility
+
+    def get_reachable(self, player=None):
+        """
+        Return the open cells the specified player could still reach by any
+        sequence of knight moves, ignoring the other player.
+
+        Parameters
+        ----------
+        player : object (optional)
+            An object registered as a player in the current game. If None,
+            return the cells reachable by the active player on the board.
+
+        Returns
+        ----------
+        int
+            A bitboard with bit `row * width + col` set for every reachable
+            cell; every open cell if the player has not moved yet.
+        """
+        if player is None:
+            player = self.active_player
+        open_cells = self.get_open_cells()
+        cell = self.__last_player_move__[player]
+        if cell is Board.NOT_MOVED:
+            return open_cells
+
+        # Flood fill outwards from the player's location one knight move at
+        # a time
+        masks = self.__tables__.knight_masks
+        frontier = masks[cell] & open_cells
+        reached = 0
+        while frontier:
+            reached |= frontier
+            neighbors = 0
+            while frontier:
+                bit = frontier & -frontier
+                neighbors |= masks[bit.bit_length() - 1]
+                frontier ^= bit
+            frontier = neighbors & open_cells & ~reached
+        return reached
+
+    def is_partitioned(self):
+        """
+        Test whether the players can no longer interfere with each other,
+        i.e., no open cell can be reached by both of them. The game is then
+        decided by the longest path each player can walk on its own.
+        """
+        if Board.NOT_MOVED in (self.__last_player_move__[self.__player_1__],
+                               self.__last_player_move__[self.__player_2__]):
+            return False
+        return not self.get_reachable(self.__player_1__) & self.get_reachable(self.__player_2__)
 
     def apply_move(self, move):
         """
@@ -199,19 +679,79 @@ class Board(object):
         ----------
         None
         """
-        row, col = move
-        self.__last_player_move__[self.active_player] = move
-        self.__board_state__[row][col] = self.__player_symbols__[self.active_player]
+        self.apply_cell(move[0] * self.width + move[1])
+
+    def apply_cell(self, cell):
+        """
+        Move the active player to the cell with index `row * width + col`
+        (see `Board.apply_move()`).
+        """
+        cell_keys, turn_key = self.__tables__.zobrist_keys
+        player_keys = cell_keys[self.__player_symbols__[self.__active_player__]]
+
+        last_cell = self.__last_player_move__[self.__active_player__]
+        if last_cell is not Board.NOT_MOVED:
+            self.__hash_key__ ^= player_keys[last_cell]
+        self.__hash_key__ ^= cell_keys[0][cell] ^ player_keys[cell] ^ turn_key
+
+        self.__last_player_move__[self.__active_player__] = cell
+        self.__board_state__ |= 1 << cell
+        self.__mobility__.clear()
         self.__active_player__, self.__inactive_player__ = self.__inactive_player__, self.__active_player__
         self.move_count += 1
 
+    def push(self, move):
+        """
+        Apply a move in place, recording the state it replaces so that the
+        move can be reverted with `Board.pop()`. This is the allocation-free
+        alternative to `Board.forecast_move()` for depth-first search.
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+
+        Returns
+        ----------
+        None
+        """
+        self.push_cell(move[0] * self.width + move[1])
+
+    def push_cell(self, cell):
+        """
+        Apply the move to the cell with index `row * width + col` in place,
+        so that it can be reverted with `Board.pop()` (see `Board.push()`).
+        """
+        self.__undo_stack__.append((self.__last_player_move__[self.__active_player__],
+                                    self.__board_state__, self.__hash_key__))
+        self.apply_cell(cell)
+
+    def pop(self):
+        """
+        Revert the most recent move applied with `Board.push()`, restoring
+        the player location, the blocked cell, the active player and the
+        move count.
+
+        Returns
+        ----------
+        None
+        """
+        last_cell, board_state, hash_key = self.__undo_stack__.pop()
+        self.__active_player__, self.__inactive_player__ = self.__inactive_player__, self.__active_player__
+        self.__last_player_move__[self.__active_player__] = last_cell
+        self.__board_state__ = board_state
+        self.__hash_key__ = hash_key
+        self.__mobility__.clear()
+        self.move_count -= 1
+
     def is_winner(self, player):
         """ Test whether the specified player has won the game. """
-        return player == self.inactive_player and not self.get_legal_moves(self.active_player)
+        return player == self.inactive_player and not self.get_mobility(self.active_player)
 
     def is_loser(self, player):
         """ Test whether the specified player has lost the game. """
-        return player == self.active_player and not self.get_legal_moves(self.active_player)
+        return player == self.active_player and not self.get_mobility(self.active_player)
 
     def utility(self, player):
         """
@@ -237,7 +777,7 @@ class Board(object):
             otherwise.
         """
 
-        if not self.get_legal_moves(self.active_player):
+        if not self.get_mobility(self.active_player):
 
             if player == self.inactive_player:
                 return float("inf")
@@ -253,17 +793,26 @@ class Board(object):
         knight in chess).
         """
 
-        if move == Board.NOT_MOVED:
-            return self.get_blank_spaces()
-
-        r, c = move
-
-        directions = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
-                      (1, -2),  (1, 2), (2, -1),  (2, 1)]
+        cell = move if move == Board.NOT_MOVED else move[0] * self.width + move[1]
+        return self.__open_cells__(cell, as_moves=True)
 
-        valid_moves = [(r+dr,c+dc) for dr, dc in directions if self.move_is_legal((r+dr, c+dc))]
+    def __open_cells__(self, cell, as_moves=False):
+        """
+        Return the open cells a player on the cell with index `row * width +
+        col` can move to -- every open cell if the player has not moved yet
+        -- as cell indexes, or as coordinate pairs (row, column) if
+        `as_moves` is True.
+        """
+        tables = self.__tables__
+        if cell is Board.NOT_MOVED:
+            entries = tables.blank_moves if as_moves else tables.blank_cells
+        else:
+            entries = (tables.knight_moves if as_moves else tables.knight_cells)[cell]
 
-        return valid_moves
+        # The tables only hold in-bounds destinations, so the occupancy test
+        # is the only check left
+        state = self.__board_state__
+        return [dest for bit, dest in entries if not state & bit]
 
     def print_board(self):
         """DEPRECATED - use Board.to_string()"""
@@ -285,11 +834,11 @@ class Board(object):
 
             for j in range(self.width):
 
-                if not self.__board_state__[i][j]:
+                if not self.__board_state__ >> (i * self.width + j) & 1:
                     out += ' '
-                elif p1_loc and i == p1_loc[0] and j == p1_loc[1]:
+                elif i * self.width + j == p1_loc:
                     out += '1'
-                elif p2_loc and i == p2_loc[0] and j == p2_loc[1]:
+                elif i * self.width + j == p2_loc:
                     out += '2'
                 else:
                     out += '-'
@@ -348,3 +897,59 @@ class Board(object):
                 return self.__inactive_player__, move_history, "illegal move"
 
             self.apply_move(curr_move)
+
+    def simulate(self, time_limit=TIME_LIMIT_MILLIS, move_history=None):
+        """
+        Execute a match between the players like `Board.play()`, but without
+        the bookkeeping needed for tournaments: turns are not timed and the
+        players are handed this board rather than a copy of it. Use it to
+        play large numbers of games quickly, e.g., between sample players.
+
+        Players must leave the board unchanged (e.g., by searching with
+        `push()` and `pop()` or `forecast_move()`), and since the time_left
+        callable always reports `time_limit` milliseconds, players that rely
+        on the timer to stop searching cannot be simulated. For all other
+        (timer-independent) players the winners are the same as with
+        `Board.play()`.
+
+        Parameters
+        ----------
+        time_limit : numeric (optional)
+            The number of milliseconds reported by the time_left callable
+            passed to the players.
+
+        move_history : list (optional)
+            If not None, the moves of the game are appended to this list in
+            the format of the move history returned by `Board.play()`.
+
+        Returns
+        ----------
+        (player, int, str)
+            Return multiple including the winning player, the number of turns
+            played (i.e., the length of the move history), and a string
+            indicating the reason for losing (e.g., illegal move).
+        """
+        time_left = lambda: time_limit
+        player_1 = self.__player_1__
+        turns = 0
+
+        while True:
+
+            player = self.__active_player__
+            legal_player_moves = self.get_legal_moves()
+            curr_move = player.get_move(self, legal_player_moves, time_left)
+
+            if curr_move is None:
+                curr_move = Board.NOT_MOVED
+
+            if player == player_1:
+                turns += 1
+                if move_history is not None:
+                    move_history.append([curr_move])
+            elif move_history is not None:
+                move_history[-1].append(curr_move)
+
+            if curr_move not in legal_player_moves:
+                return self.__inactive_player__, turns, "illegal move"
+
+            self.apply_move(curr_move)
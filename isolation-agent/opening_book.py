@@ -0,0 +1,155 @@
+"""
+Build and query an opening book for `game_agent.CustomPlayer`.
+
+The book maps every position reachable in the first few plies of a game to
+the best move found by a deep offline alpha-beta search. Positions are
+stored in a canonical orientation: the board's symmetries (8 on a square
+board, 4 otherwise) map a position and all of its rotations/reflections to
+the same key (see `isolation.Board.canonical_hash()`), so each class of
+equivalent positions is searched and stored only once. Lookups cost one
+canonical hash and a dict access.
+
+Build a book with, e.g.,
+
+    python opening_book.py --plies 4 --depth 8 --out opening_book.json
+
+and pass `OpeningBook.load("opening_book.json")` to `CustomPlayer` through
+its `opening_book` argument.
+"""
+
+import argparse
+import json
+import time
+
+
+class OpeningBook(object):
+    """
+    Best moves for the opening positions of a board of a fixed size, stored
+    in canonical orientation.
+
+    Parameters
+    ----------
+    width : int (optional)
+        The number of columns of the board the book was built for.
+
+    height : int (optional)
+        The number of rows of the board the book was built for.
+
+    moves : dict (optional)
+        Map from the canonical hash of a position (see
+        `isolation.Board.canonical_hash()`) to the best move in the
+        canonical orientation.
+    """
+
+    def __init__(self, width=7, height=7, moves=None):
+        self.width = width
+        self.height = height
+        self.moves = {} if moves is None else moves
+
+    def add(self, game, move):
+        """Record `move` as the best move in the game state."""
+        key, symmetry = game.canonical_hash()
+        self.moves[key] = game.transform_move(move, symmetry)
+
+    def __contains__(self, game):
+        return game.canonical_hash()[0] in self.moves
+
+    def __len__(self):
+        return len(self.moves)
+
+    def lookup(self, game):
+        """
+        Return the book move (row, col) for the game state, or None if the
+        position is not in the book.
+        """
+        if game.width != self.width or game.height != self.height:
+            return None
+        key, symmetry = game.canonical_hash()
+        move = self.moves.get(key)
+        if move is None:
+            return None
+        return game.transform_move(move, symmetry, inverse=True)
+
+    def save(self, path):
+        """Write the book to a JSON file."""
+        with open(path, "w") as f:
+            json.dump({"width": self.width, "height": self.height,
+                       "moves": ["{:x},{}".format(key, row * self.width + col)
+                                 for key, (row, col) in sorted(self.moves.items())]}, f)
+
+    @classmethod
+    def load(cls, path):
+        """Read a book written by `OpeningBook.save()`."""
+        with open(path) as f:
+            data = json.load(f)
+        moves = {}
+        for entry in data["moves"]:
+            key, cell = entry.split(",")
+            moves[int(key, 16)] = divmod(int(cell), data["width"])
+        return cls(data["width"], data["height"], moves)
+
+
+def build_book(plies, depth, placement_depth, score_fn, width=7, height=7, verbose=False):
+    """
+    Search every position reachable in the first `plies` plies and return
+    an `OpeningBook` of the best moves.
+
+    Positions where the player to move has not been placed yet (where every
+    open cell is a legal move) are searched to `placement_depth`; all other
+    positions to `depth`.
+    """
+    from isolation import Board
+    from game_agent import CustomPlayer
+
+    players = [CustomPlayer(score_fn=score_fn, method='alphabeta', iterative=False,
+                            tt_size=2**18, move_ordering=True) for _ in range(2)]
+    for player in players:
+        player.time_left = lambda: float("inf")
+
+    book = OpeningBook(width, height)
+    frontier = [Board(players[0], players[1], width, height)]
+
+    for ply in range(plies):
+        start = time.time()
+        successors = {}
+        for game in frontier:
+            player = game.active_player
+            if not game.get_legal_moves():
+                continue
+
+            player.search_depth = placement_depth if ply < 2 else depth
+            player.root_move_count = game.move_count
+            _, move = player.alphabeta(game, player.search_depth)
+            book.add(game, move)
+
+            if ply + 1 < plies:
+                for m in game.get_legal_moves():
+                    child = game.forecast_move(m)
+                    successors.setdefault(child.canonical_hash()[0], child)
+
+        if verbose:
+            print("ply {}: {} positions in {:.1f}s".format(ply, len(frontier), time.time() - start))
+        frontier = list(successors.values())
+
+    return book
+
+
+if __name__ == "__main__":
+    from game_agent import custom_score
+
+    parser = argparse.ArgumentParser(description="Build an opening book for CustomPlayer.")
+    parser.add_argument("--plies", type=int, default=4,
+                        help="number of plies from the start of the game covered by the book")
+    parser.add_argument("--depth", type=int, default=8,
+                        help="search depth once the player to move is on the board")
+    parser.add_argument("--placement-depth", type=int, default=5,
+                        help="search depth for the initial placement moves")
+    parser.add_argument("--width", type=int, default=7)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--out", default="opening_book.json")
+    args = parser.parse_args()
+
+    book = build_book(args.plies, args.depth, args.placement_depth, custom_score,
+                      args.width, args.height, verbose=True)
+    book.save(args.out)
+    print("{} positions written to {}".format(len(book), args.out))
@@ -1,3 +1,25 @@
+"""
+Map the strength of every opening cell: for each cell of the board, play a
+number of games of GreedyPlayer against RandomPlayer with the greedy player
+opening on that cell, and record its win probability and the average game
+length.
+
+The sweep runs over a process pool, one task per cell. Every cell is seeded
+from the sweep seed and its position, so the maps are reproducible for a
+fixed seed regardless of the number of workers. Results are written to the
+output files (raw float64 arrays, see `numpy.ndarray.tofile`) as soon as each
+cell finishes; cells not yet played hold NaN, and rerunning the sweep with
+the same files resumes it by skipping the cells already filled in.
+
+Usage: python openings_exploration.py [--width 7] [--height 7] [--trials 100]
+           [--workers N] [--seed 0] [--as-p2] [--probs FILE] [--dpths FILE]
+"""
+import argparse
+import os
+import random
+
+from multiprocessing import Pool
+
 import numpy as np
 from sample_players import *
 from isolation import Board
@@ -8,30 +30,108 @@ def runTrial(player1, player2, game, numTrials=1000):
 
     for i in range(numTrials):
         new_game = game.copy()
-        winner, history, outcome = new_game.play()
+        winner, turns, outcome = new_game.simulate()
         if winner == player1:
             wins += 1
-        avg_depth += len(history)
+        avg_depth += turns
 
     return wins/numTrials, avg_depth/numTrials
 
 
+def runCell(cell, width, height, numTrials, seed, as_p2=False):
+    """
+    Play the trials of a single opening cell.
+
+    Returns the cell, the win probability of the greedy player and the
+    average game length, or NaNs if the opening is not possible (i.e., the
+    greedy player moves second and the cell is the only one left).
+    """
+    row, col = cell
+    random.seed(seed * width * height + row * width + col)
+
+    greedy = GreedyPlayer()
+    rand = RandomPlayer()
+
+    if as_p2:
+        game = Board(rand, greedy, width, height)
+        first_moves = [m for m in game.get_legal_moves() if m != cell]
+        if not first_moves:
+            return cell, np.nan, np.nan
+        game.apply_move(random.choice(first_moves))
+        game.apply_move(cell)
+        prob, depth = runTrial(greedy, rand, game, numTrials)
+    else:
+        game = Board(greedy, rand, width, height)
+        game.apply_move(cell)
+        game.apply_move(rand.get_move(game, game.get_legal_moves(rand), lambda: 200))
+        prob, depth = runTrial(greedy, rand, game, numTrials)
+
+    return cell, prob, depth
+
+
+def _runCellJob(args):
+    return runCell(*args)
+
+
+def loadMap(path, width, height):
+    """Load a partially completed map, or start a new one filled with NaN."""
+    if path and os.path.exists(path):
+        values = np.fromfile(path)
+        if values.size == width * height:
+            return values.reshape((height, width))
+    return np.full((height, width), np.nan)
+
+
+def saveMap(values, path):
+    """Write a map to disk, replacing the previous file atomically."""
+    if path:
+        values.tofile(path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+
+def sweep(width=7, height=7, numTrials=100, workers=None, seed=0, as_p2=False,
+          probs_path=None, dpths_path=None):
+    """
+    Build the win probability and game length maps for every opening cell,
+    resuming from (and streaming results to) `probs_path` and `dpths_path`.
+    """
+    probs = loadMap(probs_path, width, height)
+    dpths = loadMap(dpths_path, width, height)
+
+    todo = [(r, c) for r in range(height) for c in range(width)
+            if np.isnan(probs[r, c]) or np.isnan(dpths[r, c])]
+    jobs = [(cell, width, height, numTrials, seed, as_p2) for cell in todo]
+
+    with Pool(workers) as pool:
+        for (r, c), prob, depth in pool.imap_unordered(_runCellJob, jobs):
+            probs[r, c] = prob
+            dpths[r, c] = depth
+            saveMap(probs, probs_path)
+            saveMap(dpths, dpths_path)
+
+    return probs, dpths
+
 
 if __name__ == "__main__":
-    width = 7
-    height = 7
-    probs = np.empty((width,height))
-    dpths = np.empty_like(probs)
-    for i in range(probs.shape[0]):
-        for j in range(probs.shape[1]):
-            player1 = GreedyPlayer()
-            player2 = RandomPlayer()
-            game = Board(player1, player2, width, height)
-            game.apply_move((i,j))
-            game.apply_move(player2.get_move(game, game.get_legal_moves(player2), lambda: 200))
-            prob, depth = runTrial(player1, player2, game, 100)
-            probs[i,j] = prob
-            dpths[i,j] = depth
+    parser = argparse.ArgumentParser(description="Map the win probability of "
+                                     "GreedyPlayer against RandomPlayer for every opening cell.")
+    parser.add_argument("--width", type=int, default=7)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--trials", type=int, default=100,
+                        help="number of games played from each opening cell")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--as-p2", action="store_true",
+                        help="the greedy player moves second")
+    parser.add_argument("--probs", default=None, metavar="FILE",
+                        help="file the win probabilities are streamed to")
+    parser.add_argument("--dpths", default=None, metavar="FILE",
+                        help="file the average game lengths are streamed to")
+    args = parser.parse_args()
+
+    probs, dpths = sweep(args.width, args.height, args.trials, args.workers,
+                         args.seed, args.as_p2, args.probs, args.dpths)
 
     print(probs)
     print(dpths)
@@ -62,7 +62,7 @@ def open_move_score(game, player):
     if game.is_winner(player):
         return float("inf")
 
-    return float(len(game.get_legal_moves(player)))
+    return float(game.get_mobility(player))
 
 
 def improved_score(game, player):
@@ -92,8 +92,8 @@ def improved_score(game, player):
     if game.is_winner(player):
         return float("inf")
 
-    own_moves = len(game.get_legal_moves(player))
-    opp_moves = len(game.get_legal_moves(game.get_opponent(player)))
+    own_moves = game.get_mobility(player)
+    opp_moves = game.get_mobility(game.get_opponent(player))
     return float(own_moves - opp_moves)
 
 
@@ -167,7 +167,12 @@ class GreedyPlayer():
 
         if not legal_moves:
             return (-1, -1)
-        _, move = max([(self.score(game.forecast_move(m), self), m) for m in legal_moves])
+        scores = []
+        for m in legal_moves:
+            game.push(m)
+            scores.append((self.score(game, self), m))
+            game.pop()
+        _, move = max(scores)
         return move
 
 
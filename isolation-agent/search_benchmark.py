@@ -0,0 +1,93 @@
+"""
+Measure how deep CustomPlayer searches within the tournament time limit as
+the number of worker processes of the parallel root search grows.
+
+Every worker count searches the same set of mid-game positions, reached by
+playing seeded random moves from an empty board, and the table reports the
+average depth of the last completed iterative deepening iteration and the
+nodes searched per move.
+
+Usage: python search_benchmark.py [--workers 1 2 4] [--positions 20]
+           [--plies 12] [--time-limit 150] [--method alphabeta] [--seed 0]
+"""
+import argparse
+import random
+import timeit
+
+from isolation import Board
+from game_agent import CustomPlayer
+from game_agent import SearchStats
+from game_agent import custom_score
+from tournament import TIME_LIMIT
+
+
+def make_positions(num_positions, plies, seed):
+    """Return move sequences leading to `num_positions` distinct positions
+    after `plies` random moves, with the player to move still able to move."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < num_positions:
+        game = Board("Player1", "Player2")
+        moves = []
+        for _ in range(plies):
+            legal_moves = game.get_legal_moves()
+            if not legal_moves:
+                break
+            moves.append(rng.choice(legal_moves))
+            game.apply_move(moves[-1])
+        if len(moves) == plies and game.get_legal_moves() and moves not in positions:
+            positions.append(moves)
+    return positions
+
+
+def run(workers, positions, time_limit, method):
+    """Search every position with a player using `workers` processes and
+    return the mean depth reached and the mean number of nodes per move."""
+    player = CustomPlayer(score_fn=custom_score, method=method, tt_size=2**16,
+                          move_ordering=True, workers=workers, collect_stats=True)
+    opponent = "Opponent"
+    try:
+        for moves in positions:
+            if len(moves) % 2:
+                game = Board(opponent, player)
+            else:
+                game = Board(player, opponent)
+            for move in moves:
+                game.apply_move(move)
+
+            move_start = 1000 * timeit.default_timer()
+            time_left = lambda: time_limit - (1000 * timeit.default_timer() - move_start)
+            player.get_move(game, game.get_legal_moves(), time_left)
+    finally:
+        player.close()
+
+    summary = SearchStats.summarize(player.stats.records)
+    return summary["mean_depth"], summary["nodes"] / float(summary["moves"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="worker counts to compare")
+    parser.add_argument("--positions", type=int, default=20,
+                        help="number of positions searched per worker count")
+    parser.add_argument("--plies", type=int, default=12,
+                        help="number of random moves played to reach each position")
+    parser.add_argument("--time-limit", type=float, default=TIME_LIMIT,
+                        help="milliseconds per move")
+    parser.add_argument("--method", default="alphabeta",
+                        choices=["minimax", "alphabeta", "pvs"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    positions = make_positions(args.positions, args.plies, args.seed)
+
+    print("{:>8}{:>12}{:>14}".format("workers", "avg depth", "nodes/move"))
+    for workers in args.workers:
+        depth, nodes = run(workers, positions, args.time_limit, args.method)
+        print("{:>8}{:>12.2f}{:>14.0f}".format(workers, depth, nodes))
+
+
+if __name__ == "__main__":
+    main()
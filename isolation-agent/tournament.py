@@ -19,11 +19,17 @@ initiative in the second match with agentB at (5, 2) as player 1 and agentA at
 (1, 3) as player 2.
 """
 
+import argparse
+import csv
 import itertools
+import json
+import os
 import random
 import warnings
 
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Queue
 
 from isolation import Board
 from sample_players import RandomPlayer
@@ -31,7 +37,9 @@ from sample_players import null_score
 from sample_players import open_move_score
 from sample_players import improved_score
 from game_agent import CustomPlayer
+from game_agent import SearchStats
 from game_agent import custom_score
+from opening_book import OpeningBook
 
 NUM_MATCHES = 5  # number of matches against each opponent
 TIME_LIMIT = 150  # number of milliseconds before timeout
@@ -102,30 +110,112 @@ def play_match(player1, player2):
     return num_wins[player1], num_wins[player2]
 
 
-def play_round(agents, num_matches):
+def seeded_match(player1, player2, seed):
+    """
+    Play a "fair" set of matches (see `play_match`) after seeding the random
+    number generator, so the random opening moves (and any random choices
+    made by the players) depend only on the seed.
+
+    Returns the number of wins of each player followed by the search
+    statistics records each player collected during the match (empty for
+    players that do not collect statistics).
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    players = (player1, player2)
+    start = [len(p.stats.records) if getattr(p, "stats", None) else 0 for p in players]
+    score_1, score_2 = play_match(player1, player2)
+    records = [p.stats.records[n:] if getattr(p, "stats", None) else []
+               for p, n in zip(players, start)]
+
+    return score_1, score_2, records[0], records[1]
+
+
+def pin_worker(cpus):
+    """
+    Process pool initializer that pins each worker to its own CPU so that
+    concurrent matches do not compete for a core, which would distort the
+    per-move time limit. Pinning is skipped where it is not supported.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        os.sched_setaffinity(0, {cpus.get_nowait()})
+    except Exception:
+        pass
+
+
+def make_executor(workers):
+    """
+    Create a process pool with at most `workers` processes (capped at the
+    number of available CPUs), each pinned to a separate CPU.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        available = sorted(os.sched_getaffinity(0))
+    else:
+        available = list(range(os.cpu_count() or 1))
+    workers = max(1, min(workers, len(available)))
+
+    cpus = Queue()
+    for cpu in available[:workers]:
+        cpus.put(cpu)
+
+    return ProcessPoolExecutor(max_workers=workers, initializer=pin_worker,
+                               initargs=(cpus,))
+
+
+def play_round(agents, num_matches, executor=None, seed=None, stats=None):
     """
     Play one round (i.e., a single match between each pair of opponents)
+
+    Matches are distributed over `executor` (a process pool) when one is
+    given, and played serially otherwise. When a seed is supplied, every
+    match is seeded with its own value derived from it, so a round is
+    reproducible (for players that do not depend on the clock) whether it
+    is played serially or in parallel.
+
+    When `stats` is a dict, the search statistics records collected by the
+    players are appended to `stats[agent_name]`.
     """
+    agent_names = {agent.player: agent.name for agent in agents}
     agent_1 = agents[-1]
     wins = 0.
     total = 0.
 
+    # Each player takes a turn going first
+    jobs = []
+    for agent_2 in agents[:-1]:
+        for p1, p2 in itertools.permutations((agent_1.player, agent_2.player)):
+            for _ in range(num_matches):
+                match_seed = None if seed is None else seed + len(jobs)
+                jobs.append((p1, p2, match_seed))
+
+    if executor is None:
+        results = (seeded_match(*job) for job in jobs)
+    else:
+        results = executor.map(seeded_match, *zip(*jobs))
+
     print("\nPlaying Matches:")
     print("----------")
 
+    # Results arrive in job order, so the tally is the same for any number
+    # of workers
+    matches_per_opponent = 2 * num_matches
     for idx, agent_2 in enumerate(agents[:-1]):
 
         counts = {agent_1.player: 0., agent_2.player: 0.}
         names = [agent_1.name, agent_2.name]
-        print("  Match {}: {!s:^11} vs {!s:^11}".format(idx + 1, *names), end=' ')
+        print("  Match {}: {!s:^11} vs {!s:^11}".format(idx + 1, *names), end=' ', flush=True)
 
-        # Each player takes a turn going first
-        for p1, p2 in itertools.permutations((agent_1.player, agent_2.player)):
-            for _ in range(num_matches):
-                score_1, score_2 = play_match(p1, p2)
-                counts[p1] += score_1
-                counts[p2] += score_2
-                total += score_1 + score_2
+        for p1, p2, _ in jobs[idx * matches_per_opponent:(idx + 1) * matches_per_opponent]:
+            score_1, score_2, records_1, records_2 = next(results)
+            if stats is not None:
+                stats.setdefault(agent_names[p1], []).extend(records_1)
+                stats.setdefault(agent_names[p2], []).extend(records_2)
+            counts[p1] += score_1
+            counts[p2] += score_2
+            total += score_1 + score_2
 
         wins += counts[agent_1.player]
 
@@ -135,14 +225,53 @@ def play_round(agents, num_matches):
     return 100. * wins / total
 
 
+def write_stats(stats, path):
+    """
+    Write the search statistics collected during the tournament to `path`,
+    as JSON (per-agent summary and records) if the file name ends with
+    ".json", or as CSV (one row per searched move) otherwise.
+    """
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump({name: {"summary": SearchStats.summarize(records),
+                              "records": records}
+                       for name, records in stats.items()}, f, indent=2)
+        return
+
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["agent"] + SearchStats.FIELDS)
+        writer.writeheader()
+        for name, records in stats.items():
+            for record in records:
+                row = dict(record, agent=name)
+                for field in ("node_counts", "depth_times"):
+                    row[field] = ";".join(str(v) for v in record[field])
+                writer.writerow(row)
+
+
 def main():
 
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of processes used to play matches in "
+                             "parallel (capped at the number of CPUs)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the random opening moves")
+    parser.add_argument("--stats", default=None, metavar="PATH",
+                        help="collect search statistics and write them to "
+                             "PATH (JSON if it ends with .json, else CSV)")
+    parser.add_argument("--book", default=None, metavar="PATH",
+                        help="opening book (see opening_book.py) used by the "
+                             "Student agent")
+    args = parser.parse_args()
+
     HEURISTICS = [("Null", null_score),
                   ("Open", open_move_score),
                   ("Improved", improved_score)]
-    AB_ARGS = {"search_depth": 5, "method": 'alphabeta', "iterative": False}
-    MM_ARGS = {"search_depth": 3, "method": 'minimax', "iterative": False}
-    CUSTOM_ARGS = {"method": 'alphabeta', 'iterative': True}
+    STATS = args.stats is not None
+    AB_ARGS = {"search_depth": 5, "method": 'alphabeta', "iterative": False, "collect_stats": STATS}
+    MM_ARGS = {"search_depth": 3, "method": 'minimax', "iterative": False, "collect_stats": STATS}
+    CUSTOM_ARGS = {"method": 'alphabeta', 'iterative': True, "collect_stats": STATS}
 
     # Create a collection of CPU agents using fixed-depth minimax or alpha beta
     # search, or random selection.  The agent names encode the search method
@@ -160,8 +289,13 @@ def main():
     # systems; i.e., the performance of the student agent is considered
     # relative to the performance of the ID_Improved agent to account for
     # faster or slower computers.
+    book = OpeningBook.load(args.book) if args.book is not None else None
     test_agents = [Agent(CustomPlayer(score_fn=improved_score, **CUSTOM_ARGS), "ID_Improved"),
-                   Agent(CustomPlayer(score_fn=custom_score, **CUSTOM_ARGS), "Student")]
+                   Agent(CustomPlayer(score_fn=custom_score, opening_book=book, endgame=True,
+                                      time_management=True, **CUSTOM_ARGS), "Student")]
+
+    executor = make_executor(args.workers) if args.workers > 1 else None
+    stats = {} if STATS else None
 
     print(DESCRIPTION)
     for agentUT in test_agents:
@@ -171,12 +305,26 @@ def main():
         print("*************************")
 
         agents = random_agents + mm_agents + ab_agents + [agentUT]
-        win_ratio = play_round(agents, NUM_MATCHES)
+        win_ratio = play_round(agents, NUM_MATCHES, executor, args.seed, stats)
 
         print("\n\nResults:")
         print("----------")
         print("{!s:<15}{:>10.2f}%".format(agentUT.name, win_ratio))
 
+    if executor is not None:
+        executor.shutdown()
+
+    if stats is not None:
+        print("\n\nSearch statistics:")
+        print("----------")
+        for name, records in stats.items():
+            summary = SearchStats.summarize(records)
+            if summary["moves"]:
+                print("{!s:<15}{:>10.0f} nodes/s{:>8.2f} avg depth{:>8.1f} ms min margin".format(
+                    name, summary["nodes_per_sec"], summary["mean_depth"],
+                    summary["min_time_margin"]))
+        write_stats(stats, args.stats)
+
 
 if __name__ == "__main__":
     main()
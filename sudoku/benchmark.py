@@ -0,0 +1,143 @@
+"""
+Benchmark the Sudoku solver engines (see solution.solve) on a corpus of
+easy, hard and diagonal puzzles.
+
+Every puzzle is cut from a different random solved grid (which satisfies the
+diagonal constraints enforced by the solver) and has a unique solution.
+'easy' puzzles keep 36-45 givens, chosen at random. 'hard' puzzles are
+minimal: givens are removed in random order as long as the solution stays
+unique, so every given left is needed. 'diagonal' is the example puzzle
+from solution.py.
+
+Usage: python benchmark.py [--puzzles N] [--seed S] [--engines a,b,...]
+"""
+import argparse
+import random
+import timeit
+
+import bitmask
+import solution
+
+DIAGONAL_GRID = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+
+ENGINES = ['propagation', 'bitmask', 'dlx']
+
+
+def random_solution(rng):
+    """
+    Generate a random solved grid.
+    Args:
+        rng(random.Random): the random generator.
+    Returns:
+        The solved grid in string form.
+    """
+    def fill(cands):
+        # Depth-first search trying the digits of each box in random order
+        unsolved = [i for i in range(81) if bitmask.popcount[cands[i]] > 1]
+        if not unsolved:
+            return cands
+        best = min(unsolved, key=lambda i: bitmask.popcount[cands[i]])
+        options = [1 << d for d in range(9) if cands[best] & (1 << d)]
+        rng.shuffle(options)
+        for bit in options:
+            attempt = cands[:]
+            attempt[best] = bit
+            if bitmask.propagate(attempt, [best]):
+                attempt = fill(attempt)
+                if attempt:
+                    return attempt
+        return False
+
+    cands = fill(bitmask.grid_candidates('.' * 81))
+    return ''.join(bitmask.digit_of[mask] for mask in cands)
+
+
+def make_corpus(num_puzzles, seed=0):
+    """
+    Generate the benchmark corpus.
+    Args:
+        num_puzzles(int): the number of easy and of hard puzzles.
+        seed(int): the seed of the random generator.
+    Returns:
+        A dict mapping each category to its list of grids.
+    """
+    rng = random.Random(seed)
+
+    def easy():
+        while True:
+            full = random_solution(rng)
+            keep = set(rng.sample(range(81), rng.randint(36, 45)))
+            grid = ''.join(full[i] if i in keep else '.' for i in range(81))
+            if bitmask.count_solutions(grid) == 1:
+                return grid
+
+    def hard():
+        grid = list(random_solution(rng))
+        order = list(range(81))
+        rng.shuffle(order)
+        for i in order:
+            given, grid[i] = grid[i], '.'
+            if bitmask.count_solutions(''.join(grid)) != 1:
+                grid[i] = given
+        return ''.join(grid)
+
+    return {'easy': [easy() for _ in range(num_puzzles)],
+            'hard': [hard() for _ in range(num_puzzles)],
+            'diagonal': [DIAGONAL_GRID]}
+
+
+def is_solution(grid, values):
+    """
+    Check that values is a valid solution of grid.
+    Args:
+        grid(string): the puzzle in string form.
+        values(dict): the solution returned by solve().
+    Returns:
+        True if every unit holds each digit once and the givens are kept.
+    """
+    if not values:
+        return False
+    if any(val != '.' and values[box] != val for box, val in zip(solution.boxes, grid)):
+        return False
+    return all(sorted(values[box] for box in unit) == list('123456789')
+               for unit in solution.unit_list)
+
+
+def run(corpus, engines=ENGINES, repeat=3):
+    """
+    Time every engine on every category of the corpus.
+    Args:
+        corpus(dict): the corpus returned by make_corpus().
+        engines(list): the engines to benchmark.
+        repeat(int): the number of timing runs per engine and category;
+            the fastest is reported.
+    Returns:
+        A dict mapping (category, engine) to the mean milliseconds per puzzle.
+    """
+    results = {}
+    for category, grids in corpus.items():
+        for engine in engines:
+            for grid in grids:
+                assert is_solution(grid, solution.solve(grid, engine)), (engine, grid)
+            seconds = min(timeit.repeat(lambda: [solution.solve(grid, engine) for grid in grids],
+                                        number=1, repeat=repeat))
+            results[(category, engine)] = 1000. * seconds / len(grids)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the Sudoku solver engines.')
+    parser.add_argument('--puzzles', type=int, default=50,
+                        help='number of easy and of hard puzzles')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engines', default=','.join(ENGINES))
+    args = parser.parse_args()
+
+    engines = args.engines.split(',')
+    corpus = make_corpus(args.puzzles, args.seed)
+    results = run(corpus, engines)
+
+    print('ms per puzzle'.ljust(12) + ''.join(engine.rjust(14) for engine in engines))
+    for category in corpus:
+        print(category.ljust(12) + ''.join('{:14.3f}'.format(results[(category, engine)])
+                                           for engine in engines))
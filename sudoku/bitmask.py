@@ -0,0 +1,200 @@
+"""
+Bitmask constraint propagation engine for the diagonal Sudoku solver.
+
+Candidates are stored as 9-bit integers (bit d-1 set when digit d is still
+possible) in a flat list indexed 0-80 in the same order as `solution.boxes`,
+and the peers and units of every box are precomputed as index tuples and
+unit masks. Propagation works on whole masks at a time: a solved digit is
+cleared from a peer with one operation, and the only choices of a unit come
+from a single pass over its nine masks (see `propagate`). The
+engine uses the same units as `solution` (rows, columns, squares and both
+diagonals) and exposes the same `solve(grid)` contract.
+"""
+from solution import boxes, unit_list, peers
+
+ALL_DIGITS = 0x1ff
+DIGITS = '123456789'
+
+box_index = dict((box, i) for i, box in enumerate(boxes))
+unit_idx = [tuple(box_index[box] for box in unit) for unit in unit_list]
+peers_of = [tuple(sorted(box_index[p] for p in peers[box])) for box in boxes]
+
+# The units of every box, as a mask with bit u set for unit_idx[u]
+unit_mask_of = [sum(1 << u for u, unit in enumerate(unit_idx) if i in unit) for i in range(81)]
+
+# Number of candidates and the digit of every single-candidate mask
+popcount = [bin(mask).count('1') for mask in range(ALL_DIGITS + 1)]
+digit_of = dict((1 << d, DIGITS[d]) for d in range(9))
+
+
+def grid_candidates(grid):
+    """
+    Convert grid into a list of candidate masks.
+    Args:
+        grid(string) - A grid in string form ('.' or '0' for empty boxes).
+    Returns:
+        A list of 81 candidate masks, or False if the givens contradict
+        each other.
+    """
+    cands = [ALL_DIGITS] * 81
+    solved = []
+    for i, val in enumerate(grid):
+        if val in DIGITS:
+            cands[i] = 1 << DIGITS.index(val)
+            solved.append(i)
+    if not propagate(cands, solved):
+        return False
+    return cands
+
+
+def propagate(cands, solved):
+    '''
+    Propagate newly solved boxes until neither rule makes progress: a solved
+    box removes its digit from its peers (eliminate), and a digit with one
+    place left in a unit goes there (only choice).
+
+    Only choices are found a unit at a time: one pass over the candidate
+    masks of the unit gives the digits seen at least once and at least
+    twice, so the digits with a single place are a few bit operations away.
+    Only the units that lost a candidate since they were last checked are
+    visited.
+    Args:
+        cands(list): The candidate masks
+        solved(list): The indexes of the boxes solved but not propagated
+            yet; consumed by the call
+    Returns:
+        True, or False if a contradiction was found
+    '''
+    while solved:
+        # Eliminate the digits of newly solved boxes from their peers
+        dirty = 0
+        while solved:
+            i = solved.pop()
+            bit = cands[i]
+            for peer in peers_of[i]:
+                mask = cands[peer]
+                if mask & bit:
+                    mask ^= bit
+                    if not mask:
+                        return False
+                    cands[peer] = mask
+                    if not mask & (mask - 1):
+                        solved.append(peer)
+                    dirty |= unit_mask_of[peer]
+
+        # Only choice, in the units that lost a candidate
+        while dirty:
+            low = dirty & -dirty
+            dirty ^= low
+            unit = unit_idx[low.bit_length() - 1]
+            once = twice = singles = 0
+            for j in unit:
+                mask = cands[j]
+                twice |= once & mask
+                once |= mask
+                if not mask & (mask - 1):
+                    singles |= mask
+            if once != ALL_DIGITS:
+                return False
+            hidden = once & ~twice & ~singles
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for j in unit:
+                    if cands[j] & bit:
+                        cands[j] = bit
+                        solved.append(j)
+                        dirty |= unit_mask_of[j]
+                        break
+                else:
+                    # The only place of the digit went to another hidden single
+                    return False
+    return True
+
+
+def search(cands):
+    '''
+    Depth-first search over the box with the fewest candidates.
+    Args:
+        cands(list): The candidate masks, already propagated
+    Returns:
+        The solved candidate masks, or False if no solution exists
+    '''
+    best, best_n = -1, 10
+    for i in range(81):
+        n = popcount[cands[i]]
+        if 1 < n < best_n:
+            best, best_n = i, n
+            if n == 2:
+                break
+    if best < 0:
+        return cands
+
+    options = cands[best]
+    while options:
+        bit = options & -options
+        options ^= bit
+        attempt = cands[:]
+        attempt[best] = bit
+        if propagate(attempt, [best]):
+            attempt = search(attempt)
+            if attempt:
+                return attempt
+    return False
+
+
+def count_solutions(grid, limit=2):
+    """
+    Count the solutions of a Sudoku grid, stopping at `limit`.
+    Args:
+        grid(string): a string representing a sudoku grid.
+        limit(int): the number of solutions at which to stop counting.
+    Returns:
+        The number of solutions, or `limit` if there are at least that many.
+    """
+    cands = grid_candidates(grid)
+    if cands is False:
+        return 0
+    return _count(cands, limit)
+
+
+def _count(cands, limit):
+    best, best_n = -1, 10
+    for i in range(81):
+        n = popcount[cands[i]]
+        if 1 < n < best_n:
+            best, best_n = i, n
+    if best < 0:
+        return 1
+
+    count = 0
+    options = cands[best]
+    while options and count < limit:
+        bit = options & -options
+        options ^= bit
+        attempt = cands[:]
+        attempt[best] = bit
+        if propagate(attempt, [best]):
+            count += _count(attempt, limit - count)
+    return count
+
+
+def solve(grid):
+    """
+    Find the solution to a Sudoku grid.
+    Args:
+        grid(string): a string representing a sudoku grid.
+            Example: '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+    Returns:
+        The dictionary representation of the final sudoku grid. False if no solution exists.
+    """
+    assert len(grid) == 81, 'Grid must be of length 81, representing a 9x9 grid'
+
+    cands = grid_candidates(grid)
+    if cands is False:
+        return False
+
+    solved = search(cands)
+    if not solved:
+        return False
+    return dict((box, digit_of[solved[i]]) for i, box in enumerate(boxes))
@@ -0,0 +1,216 @@
+"""
+Exact cover (Dancing Links / Algorithm X) backend for the diagonal Sudoku
+solver.
+
+Every (box, digit) choice is a row of the exact cover matrix. The columns
+are the constraints: each box holds exactly one digit, and each unit of
+`solution.unit_list` (rows, columns, squares and both diagonals) holds each
+digit exactly once. Columns and rows are kept in circular doubly linked
+lists stored in flat integer arrays, so covering and uncovering a column
+only rewires links.
+"""
+from solution import boxes, unit_list
+
+DIGITS = '123456789'
+
+
+class DancingLinks(object):
+    """
+    Sparse exact cover matrix with Knuth's dancing links.
+    Args:
+        num_columns(int): The number of constraints (columns).
+        rows(list): For every row, the list of column indices it covers.
+    """
+    def __init__(self, num_columns, rows):
+        # Node 0 is the root, nodes 1..num_columns are the column headers
+        n = num_columns + 1
+        self.L = [i - 1 for i in range(n)]
+        self.R = [i + 1 for i in range(n)]
+        self.L[0] = num_columns
+        self.R[num_columns] = 0
+        self.U = list(range(n))
+        self.D = list(range(n))
+        self.C = list(range(n))
+        self.row_of = [-1] * n
+        self.size = [0] * n
+        self.row_start = []
+
+        for row, columns in enumerate(rows):
+            first = None
+            for col in columns:
+                header = col + 1
+                node = len(self.C)
+                self.C.append(header)
+                self.row_of.append(row)
+                # Insert at the bottom of the column
+                self.U.append(self.U[header])
+                self.D.append(header)
+                self.D[self.U[header]] = node
+                self.U[header] = node
+                self.size[header] += 1
+                # Insert at the end of the row
+                if first is None:
+                    first = node
+                    self.L.append(node)
+                    self.R.append(node)
+                else:
+                    self.L.append(self.L[first])
+                    self.R.append(first)
+                    self.R[self.L[first]] = node
+                    self.L[first] = node
+            self.row_start.append(first)
+
+    def copy(self):
+        '''
+        Return an independent copy of the matrix in its current state.
+        '''
+        matrix = DancingLinks.__new__(DancingLinks)
+        for name in ('L', 'R', 'U', 'D', 'size'):
+            setattr(matrix, name, getattr(self, name)[:])
+        # These never change once the matrix is built
+        matrix.C = self.C
+        matrix.row_of = self.row_of
+        matrix.row_start = self.row_start
+        return matrix
+
+    def cover(self, header):
+        '''
+        Remove a column header and every row that intersects the column.
+        Args:
+            header(int): The node of the column header
+        '''
+        L, R, U, D, C, size = self.L, self.R, self.U, self.D, self.C, self.size
+        R[L[header]] = R[header]
+        L[R[header]] = L[header]
+        i = D[header]
+        while i != header:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                size[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, header):
+        '''
+        Undo cover(header), restoring the links in reverse order.
+        Args:
+            header(int): The node of the column header
+        '''
+        L, R, U, D, C, size = self.L, self.R, self.U, self.D, self.C, self.size
+        i = U[header]
+        while i != header:
+            j = L[i]
+            while j != i:
+                size[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[header]] = header
+        L[R[header]] = header
+
+    def select(self, row):
+        '''
+        Add a row to the partial solution by covering all of its columns.
+        Args:
+            row(int): The row index
+        Returns:
+            True, or False if one of its columns is already covered
+        '''
+        node = self.row_start[row]
+        j = node
+        while True:
+            header = self.C[j]
+            # A covered header is no longer linked from its neighbours
+            if self.R[self.L[header]] != header:
+                return False
+            self.cover(header)
+            j = self.R[j]
+            if j == node:
+                return True
+
+    def search(self, solution):
+        '''
+        Algorithm X: cover the column with the fewest rows and try each row.
+        Args:
+            solution(list): The rows selected so far; extended in place
+        Returns:
+            True if an exact cover was found (its rows are in solution)
+        '''
+        L, R, U, D, C, size = self.L, self.R, self.U, self.D, self.C, self.size
+        if R[0] == 0:
+            return True
+
+        header, best = 0, None
+        j = R[0]
+        while j != 0:
+            if best is None or size[j] < best:
+                header, best = j, size[j]
+                if best < 2:
+                    break
+            j = R[j]
+        if best == 0:
+            return False
+
+        self.cover(header)
+        i = D[header]
+        while i != header:
+            solution.append(self.row_of[i])
+            j = R[i]
+            while j != i:
+                self.cover(C[j])
+                j = R[j]
+            if self.search(solution):
+                return True
+            j = L[i]
+            while j != i:
+                self.uncover(C[j])
+                j = L[j]
+            solution.pop()
+            i = D[i]
+        self.uncover(header)
+        return False
+
+
+box_index = dict((box, i) for i, box in enumerate(boxes))
+
+# Row 9 * box + digit covers the box and the (unit, digit) pair of every unit of the box
+choice_columns = []
+for b, box in enumerate(boxes):
+    for d in range(9):
+        choice_columns.append([b] + [81 + 9 * u + d for u, unit in enumerate(unit_list) if box in unit])
+num_columns = 81 + 9 * len(unit_list)
+
+# The empty-grid matrix, copied for every puzzle
+empty_matrix = DancingLinks(num_columns, choice_columns)
+
+
+def solve(grid):
+    """
+    Find the solution to a Sudoku grid.
+    Args:
+        grid(string): a string representing a sudoku grid.
+            Example: '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+    Returns:
+        The dictionary representation of the final sudoku grid. False if no solution exists.
+    """
+    assert len(grid) == 81, 'Grid must be of length 81, representing a 9x9 grid'
+
+    matrix = empty_matrix.copy()
+    selected = []
+    for b, val in enumerate(grid):
+        if val in DIGITS:
+            row = 9 * b + DIGITS.index(val)
+            if not matrix.select(row):
+                return False
+            selected.append(row)
+
+    if not matrix.search(selected):
+        return False
+
+    values = {}
+    for row in selected:
+        values[boxes[row // 9]] = DIGITS[row % 9]
+    return dict((box, values[box]) for box in boxes)
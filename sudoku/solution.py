@@ -1,15 +1,96 @@
-assignments = []
+import threading
+import timeit
+
+from collections import deque
+from multiprocessing import Pool
+
 rows = 'ABCDEFGHI'
 cols = '123456789'
 
+
+class AssignmentTracer(object):
+    """
+    Records the board every time assign_value() solves a box. Recording is
+    opt-in: set the module-level `tracer` to an instance of this class.
+    Modes:
+        'off': record nothing.
+        'delta': keep the first recorded board in `initial` and, for every
+            later record, only the boxes that changed since the previous
+            record in `deltas` (a list of {box: value} dicts).
+        'ring': keep full copies of the last `size` boards in `snapshots`.
+    """
+    def __init__(self, mode='delta', size=100):
+        if mode not in ('off', 'delta', 'ring'):
+            raise ValueError('Unknown tracer mode: {}'.format(mode))
+        self.mode = mode
+        self.initial = None
+        self.deltas = []
+        self.snapshots = deque(maxlen=size)
+        self._last = None
+
+    def record(self, values):
+        """
+        Record the current board.
+        Args:
+            values(dict): The sudoku in dictionary form
+        """
+        if self.mode == 'delta':
+            last = self._last
+            if last is None:
+                self.initial = values.copy()
+                self._last = values.copy()
+                return
+            # Diffing against the last record (rather than logging the
+            # assignment) keeps the replay exact when search backtracks
+            diff = dict((box, value) for box, value in values.items() if last[box] != value)
+            if diff:
+                self.deltas.append(diff)
+                last.update(diff)
+        elif self.mode == 'ring':
+            self.snapshots.append(values.copy())
+
+
+class AssignmentLog(object):
+    """
+    Read-only list of the boards recorded by the installed delta-mode
+    tracer: a full copy of the board for every record, like the
+    `assignments` list that assign_value() used to fill. The boards are
+    rebuilt from the deltas when the log is read, and the log is empty
+    while no delta-mode tracer is installed.
+    """
+    def __len__(self):
+        if tracer is None or tracer.mode != 'delta' or tracer.initial is None:
+            return 0
+        return 1 + len(tracer.deltas)
+
+    def __iter__(self):
+        if not len(self):
+            return
+        board = tracer.initial.copy()
+        yield board.copy()
+        for diff in tracer.deltas:
+            board.update(diff)
+            yield board.copy()
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+
+tracer = None
+
+# Kept for code written against the original module; install a delta-mode
+# tracer to fill it
+assignments = AssignmentLog()
+
 def assign_value(values, box, value):
     """
     Please use this function to update your values dictionary!
-    Assigns a value to a given box. If it updates the board record it.
+    Assigns a value to a given box. If it updates the board and a tracer is
+    installed, record it.
     """
     values[box] = value
-    if len(value) == 1:
-        assignments.append(values.copy())
+    if tracer is not None and len(value) == 1:
+        tracer.record(values)
     return values
 
 def naked_twins(values):
@@ -59,6 +140,7 @@ square_units = [cross(rs, cs) for rs in ('ABC','DEF','GHI') for cs in ('123','45
 diag_units = [[r+c for r,c in zip(rows, cols)], [r+c for r,c in zip(rows, cols[::-1])]]
 unit_list = row_units + column_units + square_units + diag_units
 units = dict((s, [u for u in unit_list if s in u]) for s in boxes)
+box_units = dict((s, [i for i, u in enumerate(unit_list) if s in u]) for s in boxes)
 peers = dict((s, set(sum(units[s],[]))-set([s])) for s in boxes)
 
 def grid_values(grid):
@@ -148,59 +230,111 @@ def only_choice(values):
     return values
 
 
-def reduce_puzzle(values):
+def reduce_puzzle(values, changed=None, trail=None, record=True):
     '''
-    Iteratively applies eliminate() and only_choice(). If a solution is found,
+    Applies eliminate() and only_choice() until neither makes progress, using
+    a worklist: only the peers of newly solved boxes and the units of boxes
+    that lost a candidate are revisited. If a solution is found,
     it is returned. If a box is found to have no solutions, False
     Args:
         values(dict): The sudoku in dictionary form
+        changed(iterable): The boxes changed since values was last reduced;
+            None if every box and unit must be checked
+        trail(list): If given, a (box, previous value) pair is appended for
+            every box changed, so that the changes can be undone
+        record(bool): False to make the changes without passing them to
+            the installed tracer (see assign_value)
     Returns:
         If a solution is found: Dictionary of the solved sudoku
         If no progress is made: Dictionary of the unsolved soduku
         If no valid solution exists: False
     '''
-    # Check the number of solved boxes in order to track progress
-    solved_boxes = [box for box in values if len(values[box]) == 1]
-    stop = False
-
-    while not stop:
-        # Count the number of solved boxes before applying eliminate and only_choice
-        solved_before = len([box for box in values if len(values[box]) == 1])
-
-        # Apply eliminate
-        values = eliminate(values)
-
-        # Apply only_choice
-        values = only_choice(values)
-
-        # Apply naked twins
-        #values = naked_twins(values)
-
-        # Count the number of solved boxes now
-        solved_after = len([box for box in values if len(values[box]) == 1])
-
-        # Check progress and stop if stalled
-        stop = solved_after == solved_before
-
-        # Check if solution is invalid
-        if len([box for box in values if len(values[box]) == 0]):
-            return False
+    if changed is None:
+        changed = boxes
+        dirty_units = set(range(len(unit_list)))
+    else:
+        dirty_units = set()
+
+    # Solved boxes whose digit must still be eliminated from their peers
+    solved_queue = deque(box for box in changed if len(values[box]) == 1)
+    for box in changed:
+        dirty_units.update(box_units[box])
+
+    while solved_queue or dirty_units:
+        # Eliminate the digits of newly solved boxes from their peers
+        while solved_queue:
+            box = solved_queue.popleft()
+            digit = values[box]
+            for peer in peers[box]:
+                if digit in values[peer]:
+                    new_value = values[peer].replace(digit, '')
+                    if not new_value:
+                        return False
+                    if trail is not None:
+                        trail.append((peer, values[peer]))
+                    if record:
+                        assign_value(values, peer, new_value)
+                    else:
+                        values[peer] = new_value
+                    dirty_units.update(box_units[peer])
+                    if len(new_value) == 1:
+                        solved_queue.append(peer)
+
+        # Only choice, in the units that lost a candidate
+        while dirty_units and not solved_queue:
+            unit = unit_list[dirty_units.pop()]
+            for digit in '123456789':
+                boxes_w_digit = [box for box in unit if digit in values[box]]
+                if not boxes_w_digit:
+                    return False
+                if len(boxes_w_digit) == 1 and len(values[boxes_w_digit[0]]) > 1:
+                    box = boxes_w_digit[0]
+                    if trail is not None:
+                        trail.append((box, values[box]))
+                    if record:
+                        assign_value(values, box, digit)
+                    else:
+                        values[box] = digit
+                    dirty_units.update(box_units[box])
+                    solved_queue.append(box)
 
     # Once complete, return values
     return values
 
 
-def search(values):
+def undo(values, trail, mark):
+    '''
+    Roll values back to the state it had when the trail had `mark` entries.
+    Args:
+        values(dict): The sudoku in dictionary form
+        trail(list): The (box, previous value) pairs logged by reduce_puzzle and search
+        mark(int): The length of the trail to roll back to
+    '''
+    while len(trail) > mark:
+        box, value = trail.pop()
+        values[box] = value
+
+
+def search(values, changed=None, trail=None, record=True):
     '''
     Traverse a tree using depth-first search to solve the sudoku
     Args:
         values(dict): The sudoku in dictionary form
+        changed(iterable): The boxes changed since values was last reduced
+            (see reduce_puzzle); None if values was never reduced
+        trail(list): If given, search values in place: every change is logged
+            on the trail and undone when a branch fails, instead of copying
+            values for each digit tried
+        record(bool): False to solve without recording (see reduce_puzzle)
     Returns:
         If a solution is found: Dictionary of the solved sudoku
         If no valid solution exists: False
     '''
+    if trail is not None:
+        return search_trail(values, changed, trail, record)
+
     # Attempt to solve the puzzle
-    reduced = reduce_puzzle(values)
+    reduced = reduce_puzzle(values, changed, record=record)
 
     # If attempt failed, return False
     if reduced is False:
@@ -226,35 +360,171 @@ def search(values):
             for digit in reduced[box_loc]:
                 new_values = values.copy()
                 new_values[box_loc] = digit
-                attempt = search(new_values)
+                attempt = search(new_values, [box_loc], record=record)
                 if attempt:
                     return attempt
 
 
-def solve(grid):
+def search_trail(values, changed, trail, record=True):
+    '''
+    In-place depth-first search used by search() when given a trail.
+    Args:
+        values(dict): The sudoku in dictionary form
+        changed(iterable): The boxes changed since values was last reduced
+        trail(list): The undo log shared by the whole search
+        record(bool): False to solve without recording (see reduce_puzzle)
+    Returns:
+        If a solution is found: values, solved
+        If no valid solution exists: False
+    '''
+    if reduce_puzzle(values, changed, trail, record) is False:
+        return False
+
+    # Pick one of the boxes with the fewest remaining options
+    box_loc = ''
+    box_n = 10
+    for box in boxes:
+        n = len(values[box])
+        if 1 < n < box_n:
+            box_loc = box
+            box_n = n
+
+    # If all boxes are solved then return the solution
+    if not box_loc:
+        return values
+
+    # Try the remaining options for the box, undoing the changes of every
+    # branch that fails
+    for digit in values[box_loc]:
+        mark = len(trail)
+        trail.append((box_loc, values[box_loc]))
+        values[box_loc] = digit
+        if search_trail(values, [box_loc], trail, record):
+            return values
+        undo(values, trail, mark)
+
+    return False
+
+
+def solve(grid, engine='propagation', record=True):
     """
     Find the solution to a Sudoku grid.
     Args:
         grid(string): a string representing a sudoku grid.
             Example: '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+        engine(string): 'propagation' to search over the dictionary of candidate
+            strings in this module, 'bitmask' for the bitmask engine in bitmask.py,
+            or 'dlx' for the exact cover (Dancing Links) backend in dlx.py
+        record(bool): False to solve without recording assignments, even
+            if a tracer is installed (only the 'propagation' engine records)
     Returns:
         The dictionary representation of the final sudoku grid. False if no solution exists.
     """
     assert len(grid) == 81, 'Grid must be of length 81, representing a 9x9 grid'
 
+    if engine == 'bitmask':
+        import bitmask
+        return bitmask.solve(grid)
+    elif engine == 'dlx':
+        import dlx
+        return dlx.solve(grid)
+    elif engine != 'propagation':
+        raise ValueError('Unknown engine: {}'.format(engine))
+
     # Convert grid to dict representation
     values = grid_values(grid)
 
     # Apply search
-    return search(values)
+    return search(values, trail=[], record=record)
+
+def timed_solve(grid, engine='propagation', record=True):
+    """
+    Solve a grid and measure the time it took.
+    Args:
+        grid(string): a string representing a sudoku grid.
+        engine(string): the solver engine (see solve()).
+        record(bool): False to solve without recording (see solve()).
+    Returns:
+        A (solution, seconds) tuple, where solution is the dictionary returned by solve().
+    """
+    start = timeit.default_timer()
+    values = solve(grid, engine, record)
+    return values, timeit.default_timer() - start
+
+
+def _timed_solve_job(job):
+    return timed_solve(job[0], job[1], record=False)
+
+
+def read_grids(path):
+    """
+    Stream grids from a file with one 81-character grid per line.
+    Args:
+        path(string): the file name.
+    Yields:
+        Each non-empty line of the file, stripped of whitespace.
+    """
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def solve_many(grids, workers=1, engine='propagation', chunksize=16):
+    """
+    Solve a batch of Sudoku grids, optionally across a pool of processes.
+    Assignments are not recorded while the batch is solved.
+    Args:
+        grids: an iterable of grid strings, or the name of a file with one grid per line.
+        workers(int): the number of processes; 1 solves the grids in this process.
+        engine(string): the solver engine (see solve()).
+        chunksize(int): the number of grids sent to a worker at a time.
+    Yields:
+        A (solution, seconds) tuple for each grid, in input order.
+    """
+    if isinstance(grids, str):
+        grids = read_grids(grids)
+
+    if workers <= 1:
+        for grid in grids:
+            yield timed_solve(grid, engine, record=False)
+        return
+
+    # The pool reads its input in a thread of its own, as fast as it can, so
+    # the jobs are throttled to a few chunks per worker ahead of the results
+    # consumed: the workers never wait for the next batch, and a long stream
+    # is never read into memory all at once
+    pending = threading.Semaphore(workers * chunksize * 4)
+    stopped = threading.Event()
+
+    def jobs():
+        for grid in grids:
+            pending.acquire()
+            if stopped.is_set():
+                return
+            yield grid, engine
+
+    with Pool(workers) as pool:
+        try:
+            for result in pool.imap(_timed_solve_job, jobs(), chunksize):
+                pending.release()
+                yield result
+        finally:
+            # Unblock the input thread if the consumer stopped early, so
+            # that the pool can shut down
+            stopped.set()
+            pending.release()
+
 
 if __name__ == '__main__':
     diag_sudoku_grid = '2.............62....1....7...6..8...3...9...7...6..4...4....8....52.............3'
+    tracer = AssignmentTracer('delta')
     display(solve(diag_sudoku_grid))
 
     try:
         from visualize import visualize_assignments
-        visualize_assignments(assignments)
+        visualize_assignments(tracer.initial, tracer.deltas)
 
     except SystemExit:
         pass
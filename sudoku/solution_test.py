@@ -1,6 +1,12 @@
-import solution
+import os
+import tempfile
 import unittest
 
+import benchmark
+import bitmask
+import solution
+import visualize
+
 
 class TestNakedTwins(unittest.TestCase):
     before_naked_twins_1 = {'I6': '4', 'H9': '3', 'I2': '6', 'E8': '1', 'H3': '5', 'H7': '8', 'I7': '1', 'I4': '8',
@@ -94,5 +100,202 @@ class TestDiagonalSudoku(unittest.TestCase):
     def test_solve(self):
         self.assertEqual(solution.solve(self.diagonal_grid), self.solved_diag_sudoku)
 
+    def test_solve_bitmask(self):
+        self.assertEqual(solution.solve(self.diagonal_grid, engine='bitmask'), self.solved_diag_sudoku)
+
+    def test_solve_dlx(self):
+        self.assertEqual(solution.solve(self.diagonal_grid, engine='dlx'), self.solved_diag_sudoku)
+
+
+class TestReducePuzzle(unittest.TestCase):
+
+    def test_no_place_for_digit(self):
+        """ A unit with no place left for a digit is a contradiction, even if
+        every box still has candidates """
+        values = solution.grid_values('.' * 81)
+        for box in solution.row_units[0]:
+            values[box] = '12345678'
+        self.assertFalse(solution.reduce_puzzle(dict(values)))
+        self.assertFalse(solution.reduce_puzzle(dict(values), changed=['A1']))
+
+    def test_changed_boxes(self):
+        """ Reducing from the changed boxes matches reducing every box """
+        values = solution.reduce_puzzle(solution.grid_values(benchmark.make_corpus(1)['hard'][0]))
+        box = min((box for box in values if len(values[box]) > 1), key=lambda box: len(values[box]))
+        for digit in values[box]:
+            expected = dict(values, **{box: digit})
+            changed = dict(expected)
+            self.assertEqual(solution.reduce_puzzle(expected), solution.reduce_puzzle(changed, [box]))
+
+
+class TestTrailSearch(unittest.TestCase):
+
+    def test_undo(self):
+        """ Rolling back the trail restores values exactly """
+        values = solution.grid_values(benchmark.make_corpus(1)['hard'][0])
+        original = dict(values)
+        trail = []
+        solution.reduce_puzzle(values, trail=trail)
+        reduced = dict(values)
+
+        mark = len(trail)
+        box = min((box for box in values if len(values[box]) > 1), key=lambda box: len(values[box]))
+        trail.append((box, values[box]))
+        values[box] = values[box][0]
+        solution.reduce_puzzle(values, [box], trail)
+        self.assertNotEqual(reduced, values)
+
+        solution.undo(values, trail, mark)
+        self.assertEqual(reduced, values)
+        solution.undo(values, trail, 0)
+        self.assertEqual(original, values)
+
+    def test_copy_and_trail_agree(self):
+        for grids in benchmark.make_corpus(3).values():
+            for grid in grids:
+                self.assertEqual(solution.search(solution.grid_values(grid)),
+                                 solution.search(solution.grid_values(grid), trail=[]))
+
+
+class TestEngines(unittest.TestCase):
+    engines = ['propagation', 'bitmask', 'dlx']
+
+    # Two 1s in a row, two 1s on the main diagonal, and givens that only
+    # contradict each other once propagated
+    contradictory_grids = ['11' + '.' * 79,
+                           '1' + '.' * 79 + '1',
+                           '23............62....1....7...6..8...3...9...7...6..4...4....8....52.............3']
+
+    def test_corpus(self):
+        for category, grids in benchmark.make_corpus(5).items():
+            for grid in grids:
+                self.assertEqual(1, bitmask.count_solutions(grid), (category, grid))
+                expected = solution.solve(grid, self.engines[0])
+                self.assertTrue(benchmark.is_solution(grid, expected), (category, grid))
+                for engine in self.engines[1:]:
+                    self.assertEqual(expected, solution.solve(grid, engine), (category, engine, grid))
+
+    def test_count_solutions(self):
+        self.assertEqual(1, bitmask.count_solutions(TestDiagonalSudoku.diagonal_grid))
+        self.assertEqual(2, bitmask.count_solutions('.' * 81))
+        self.assertEqual(0, bitmask.count_solutions(self.contradictory_grids[2]))
+
+    def test_contradictory_givens(self):
+        for grid in self.contradictory_grids:
+            for engine in self.engines:
+                self.assertFalse(solution.solve(grid, engine), (engine, grid))
+
+
+class TestAssignmentTracer(unittest.TestCase):
+
+    class Recorder(solution.AssignmentTracer):
+        """ Delta tracer that also keeps a full copy of every board recorded """
+        def __init__(self):
+            solution.AssignmentTracer.__init__(self, 'delta')
+            self.boards = []
+
+        def record(self, values):
+            solution.AssignmentTracer.record(self, values)
+            if not self.boards or self.boards[-1] != values:
+                self.boards.append(values.copy())
+
+    def trace(self, tracer, grid):
+        installed = solution.tracer
+        solution.tracer = tracer
+        try:
+            return solution.solve(grid)
+        finally:
+            solution.tracer = installed
+
+    def test_delta(self):
+        """ Replaying the deltas rebuilds every board, also after backtracking """
+        for grid in [TestDiagonalSudoku.diagonal_grid] + benchmark.make_corpus(2)['hard']:
+            tracer = self.Recorder()
+            values = self.trace(tracer, grid)
+
+            board = tracer.initial.copy()
+            replayed = [board.copy()]
+            for diff in tracer.deltas:
+                board.update(diff)
+                replayed.append(board.copy())
+            self.assertEqual(tracer.boards, replayed)
+            self.assertEqual(values, replayed[-1])
+
+            boards = visualize.replay_assignments(tracer.initial, tracer.deltas)
+            self.assertEqual(values, boards[-1])
+            for board in boards:
+                self.assertIn(board, tracer.boards)
+
+    def test_assignments(self):
+        """ The assignments log lists the boards of the delta tracer """
+        self.assertEqual([], list(solution.assignments))
+        tracer = self.Recorder()
+        installed = solution.tracer
+        solution.tracer = tracer
+        try:
+            values = solution.solve(TestDiagonalSudoku.diagonal_grid)
+            self.assertEqual(len(tracer.boards), len(solution.assignments))
+            self.assertEqual(tracer.boards, list(solution.assignments))
+            self.assertEqual(values, solution.assignments[-1])
+        finally:
+            solution.tracer = installed
+        self.assertEqual(0, len(solution.assignments))
+
+    def test_ring(self):
+        tracer = solution.AssignmentTracer('ring', size=5)
+        values = self.trace(tracer, TestDiagonalSudoku.diagonal_grid)
+        self.assertEqual(5, len(tracer.snapshots))
+        self.assertEqual(values, tracer.snapshots[-1])
+
+    def test_off(self):
+        tracer = solution.AssignmentTracer('off')
+        self.assertEqual(TestDiagonalSudoku.solved_diag_sudoku,
+                         self.trace(tracer, TestDiagonalSudoku.diagonal_grid))
+        self.assertIsNone(tracer.initial)
+        self.assertEqual([], tracer.deltas)
+        self.assertEqual(0, len(tracer.snapshots))
+
+    def test_unknown_mode(self):
+        self.assertRaises(ValueError, solution.AssignmentTracer, 'full')
+
+
+class TestSolveMany(unittest.TestCase):
+    grids = benchmark.make_corpus(3)['easy'] + [TestDiagonalSudoku.diagonal_grid, TestEngines.contradictory_grids[0]]
+
+    def check_results(self, results):
+        self.assertEqual(len(self.grids), len(results))
+        for grid, (values, seconds) in zip(self.grids, results):
+            self.assertEqual(solution.solve(grid), values)
+            self.assertGreaterEqual(seconds, 0.)
+
+    def test_serial(self):
+        self.check_results(list(solution.solve_many(self.grids)))
+
+    def test_pool(self):
+        self.check_results(list(solution.solve_many(iter(self.grids), workers=2, chunksize=1)))
+
+    def test_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write('\n'.join(self.grids) + '\n\n')
+        try:
+            self.check_results(list(solution.solve_many(f.name, workers=2, chunksize=2)))
+        finally:
+            os.remove(f.name)
+
+    def test_recording(self):
+        """ The batch records nothing, but does not stop the caller from recording """
+        installed = solution.tracer
+        solution.tracer = tracer = solution.AssignmentTracer('delta')
+        try:
+            recorded = 0
+            for _ in solution.solve_many(self.grids[:3]):
+                self.assertEqual(recorded, len(tracer.deltas))
+                solution.solve(self.grids[3])
+                self.assertGreater(len(tracer.deltas), recorded)
+                recorded = len(tracer.deltas)
+        finally:
+            solution.tracer = installed
+
+
 if __name__ == '__main__':
     unittest.main()
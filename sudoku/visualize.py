@@ -1,17 +1,18 @@
-from PySudoku import play
+def replay_assignments(initial, deltas):
+    """ Rebuild the boards recorded by a delta-mode AssignmentTracer, keeping
+    only the boards where a new box was solved"""
+    values = initial.copy()
+    boards = [values.copy()]
 
-def visualize_assignments(assignments):
-    """ Visualizes the set of assignments created by the Sudoku AI"""
-    last_assignment = None
-    filtered_assignments = []
+    for diff in deltas:
+        values.update(diff)
+        if any(len(value) == 1 for value in diff.values()):
+            boards.append(values.copy())
 
-    for i in range(len(assignments)):
-        if last_assignment:
-            last_assignment_items = [item for item in last_assignment.items() if len(item[1]) == 1]
-            current_assignment_items = [item for item in assignments[i].items() if len(item[1]) == 1]
-            shared_items = set(last_assignment_items) & set(current_assignment_items)
-            if len(shared_items) < len(current_assignment_items):
-                filtered_assignments.append(assignments[i])
-        last_assignment = assignments[i]
+    return boards
 
-    play(filtered_assignments)
+def visualize_assignments(initial, deltas):
+    """ Visualizes the set of assignments created by the Sudoku AI"""
+    # pygame is only needed to show the boards, not to rebuild them
+    from PySudoku import play
+    play(replay_assignments(initial, deltas))